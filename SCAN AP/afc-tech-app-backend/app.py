@@ -40,6 +40,7 @@ def create_app():
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     app.config["JWT_SECRET"] = jwt_secret
     app.config["JWT_EXPIRY_HOURS"] = os.getenv("JWT_EXPIRY_HOURS", "12")
+    app.config["SSE_TOKEN_SECONDS"] = os.getenv("SSE_TOKEN_SECONDS", "300")
     app.config["MAX_CONTENT_LENGTH"] = 2 * 1024 * 1024  # 2 MB request bodies
 
     cors_origins = [
@@ -1,9 +1,35 @@
 """Shared Flask extensions (initialized in app factory)."""
+import os
+import tempfile
+
+import jwt
+from flask import request
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
+import utility.ratelimit_storage  # noqa: F401  registers the sqlite:// scheme
+from middleware.jwt_utils import decode_access_token
+
+_DEFAULT_STORAGE = "sqlite:///" + os.path.join(tempfile.gettempdir(), "afc_ratelimit.db")
+
+
+def rate_limit_key():
+    """
+    Bucket per authenticated technician (token subject) so a whole hospital
+    behind one NAT doesn't share a limit; unauthenticated requests fall back
+    to the client address.
+    """
+    auth = request.headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        try:
+            return "tech:" + str(decode_access_token(auth[7:].strip())["sub"])
+        except (jwt.InvalidTokenError, KeyError):
+            pass
+    return "ip:" + (get_remote_address() or "unknown")
+
+
 limiter = Limiter(
-    key_func=get_remote_address,
-    storage_uri="memory://",
+    key_func=rate_limit_key,
+    storage_uri=os.getenv("RATELIMIT_STORAGE_URI", _DEFAULT_STORAGE),
     default_limits=["300 per hour"],
 )
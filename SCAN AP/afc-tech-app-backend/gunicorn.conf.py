@@ -0,0 +1,19 @@
+"""
+gunicorn settings, picked up automatically when started from this directory:
+
+  gunicorn app:app
+
+Threaded workers (gthread) are required, not just faster: PIN hashing
+(middleware/pin_utils.py) and the admin SSE feed (GET /api/admin/events)
+both assume that a slow request holds one thread, not a whole worker
+process. bcrypt releases the GIL, so scans keep being served by the other
+threads of a worker while a login hashes.
+"""
+import os
+
+bind = "0.0.0.0:" + os.getenv("PORT", "5000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+# SSE_MAX_SECONDS in routes/admin.py is kept below this
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
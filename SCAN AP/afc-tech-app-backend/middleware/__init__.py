@@ -1,4 +1,4 @@
 """Middleware package for authentication and authorization."""
-from .auth import current_tech_id, is_admin, require_admin, require_auth
+from .auth import current_tech_id, invalidate_identity, is_admin, require_admin, require_auth
 
-__all__ = ["require_auth", "require_admin", "current_tech_id", "is_admin"]
+__all__ = ["require_auth", "require_admin", "current_tech_id", "is_admin", "invalidate_identity"]
@@ -3,15 +3,61 @@ Authentication and authorization middleware for Flask routes.
 
 All protected routes require a valid Bearer JWT issued at login.
 Admin routes additionally require role == 'admin' in the token and database.
+The admin event stream instead takes a short-lived stream-scoped token in
+?access_token= (EventSource can't send headers); that token is refused
+everywhere else, and login tokens are never read from the URL.
+The database check is served from a short-TTL identity cache that is
+invalidated whenever a technician's `active` or `role` is changed.
 """
+import os
+from collections import namedtuple
 from functools import wraps
 
 import jwt
 from flask import g, jsonify, request
+from sqlalchemy import event
 
 from db import db
-from middleware.jwt_utils import decode_access_token
+from middleware.jwt_utils import STREAM_SCOPE, decode_access_token
 from models import Technician
+from utility.cache import LRUCache
+
+Identity = namedtuple("Identity", ["id", "name", "active", "role"])
+
+# tech id -> Identity (active technicians only)
+_identity_cache = LRUCache(
+    maxsize=int(os.getenv("AUTH_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30")),
+)
+
+
+def invalidate_identity(tech_id=None):
+    """Forget one cached identity, or all of them when tech_id is None."""
+    if tech_id is None:
+        _identity_cache.clear()
+    else:
+        _identity_cache.invalidate(tech_id)
+
+
+@event.listens_for(Technician.active, "set")
+@event.listens_for(Technician.role, "set")
+def _technician_access_changed(target, value, oldvalue, initiator):
+    if target.id is not None:
+        invalidate_identity(target.id)
+
+
+def _load_identity(tech_id):
+    ident = _identity_cache.get(tech_id)
+    if ident is not None:
+        return ident
+
+    tech = db.session.get(Technician, tech_id)
+    if not tech or not tech.active:
+        return None
+
+    ident = Identity(tech.id, tech.name, tech.active, getattr(tech, "role", "technician"))
+    _identity_cache.set(tech_id, ident)
+    return ident
 
 
 def _bearer_token():
@@ -21,13 +67,16 @@ def _bearer_token():
     return None
 
 
-def _authenticate_request():
-    token = _bearer_token()
+def _authenticate_request(stream=False):
+    """`stream` routes take only a stream-scoped token from ?access_token=."""
+    token = request.args.get("access_token") if stream else _bearer_token()
     if not token:
         return jsonify({"error": "Authentication required"}), 401
 
     try:
         payload = decode_access_token(token)
+        if payload.get("scope") != (STREAM_SCOPE if stream else None):
+            return jsonify({"error": "Invalid token"}), 401
         tech_id = int(payload["sub"])
     except jwt.ExpiredSignatureError:
         return jsonify({"error": "Token expired"}), 401
@@ -35,13 +84,13 @@ def _authenticate_request():
         return jsonify({"error": "Invalid token"}), 401
 
     try:
-        tech = db.session.get(Technician, tech_id)
-        if not tech or not tech.active:
+        ident = _load_identity(tech_id)
+        if ident is None:
             return jsonify({"error": "Invalid or inactive account"}), 401
 
-        g.current_tech = tech
-        g.current_tech_id = tech.id
-        g.current_tech_role = getattr(tech, "role", "technician")
+        g.current_tech = ident
+        g.current_tech_id = ident.id
+        g.current_tech_role = ident.role
     except Exception:
         return jsonify({"error": "Authentication failed"}), 401
 
@@ -61,12 +110,10 @@ def require_auth(f):
     return decorated_function
 
 
-def require_admin(f):
-    """Require JWT + admin role (verified against database, not token alone)."""
-
+def _admin_only(f, stream):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        err = _authenticate_request()
+        err = _authenticate_request(stream)
         if err is not None:
             return err
         if g.current_tech_role != "admin":
@@ -76,6 +123,16 @@ def require_admin(f):
     return decorated_function
 
 
+def require_admin(f):
+    """Require JWT + admin role (verified against database / identity cache, not token alone)."""
+    return _admin_only(f, stream=False)
+
+
+def require_admin_stream(f):
+    """Admin check for the event stream: stream-scoped ?access_token= instead of the header."""
+    return _admin_only(f, stream=True)
+
+
 def current_tech_id():
     return getattr(g, "current_tech_id", None)
 
@@ -19,6 +19,29 @@ def create_access_token(tech_id: int, role: str) -> str:
     return jwt.encode(payload, secret, algorithm="HS256")
 
 
+# Scope claim of the short-lived tokens accepted only by the admin event stream
+STREAM_SCOPE = "admin-events"
+
+
+def create_stream_token(tech_id: int, role: str) -> str:
+    """
+    Token for GET /admin/events only. EventSource can't send headers, so it
+    travels in the URL (and so in access logs); it is scoped and expires in
+    SSE_TOKEN_SECONDS (default 300) instead of carrying the login token.
+    """
+    secret = current_app.config["JWT_SECRET"]
+    seconds = int(current_app.config.get("SSE_TOKEN_SECONDS", 300))
+    now = datetime.now(timezone.utc)
+    payload = {
+        "sub": str(tech_id),
+        "role": role,
+        "scope": STREAM_SCOPE,
+        "iat": int(now.timestamp()),
+        "exp": int((now + timedelta(seconds=seconds)).timestamp()),
+    }
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
 def token_string(token) -> str:
     """PyJWT may return str or bytes depending on version."""
     if isinstance(token, bytes):
@@ -1,23 +1,81 @@
-"""PIN hashing and verification (supports legacy plain-text during migration)."""
+"""PIN hashing and verification (supports legacy plain-text during migration).
+
+At most BCRYPT_THREADS bcrypt calls run at once per process, so a burst of
+logins cannot take every CPU away from the scan endpoints. bcrypt runs on
+the request's own thread; a caller waits up to BCRYPT_TIMEOUT_SECONDS for a
+slot and gets PinServiceBusy instead of queueing behind the burst. A hash
+that has started always runs to completion. BCRYPT_ROUNDS sets the work
+factor for new hashes.
+
+This only works with threaded workers (gthread, see gunicorn.conf.py): bcrypt
+releases the GIL, so the worker's other threads keep serving scans while a
+login hashes. Under sync workers each process serves one request at a time,
+the semaphore never blocks and a login holds its whole worker for the hash.
+"""
+import os
+import threading
+
 import bcrypt
 
 _BCRYPT_PREFIX = "$2b$"
 
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_THREADS = int(os.getenv("BCRYPT_THREADS", "2"))
+BCRYPT_TIMEOUT_SECONDS = float(os.getenv("BCRYPT_TIMEOUT_SECONDS", "5"))
+
+_slots = threading.BoundedSemaphore(max(1, BCRYPT_THREADS))
+
+
+class PinServiceBusy(Exception):
+    """Raised when no bcrypt slot frees up within BCRYPT_TIMEOUT_SECONDS."""
+
+
+def _run(fn, *args):
+    if not _slots.acquire(timeout=BCRYPT_TIMEOUT_SECONDS):
+        raise PinServiceBusy()
+    try:
+        return fn(*args)
+    finally:
+        _slots.release()
+
 
 def is_hashed(value: str) -> bool:
     return isinstance(value, str) and value.startswith(_BCRYPT_PREFIX)
 
 
+def hash_rounds(stored: str):
+    """Work factor of a bcrypt hash ("$2b$12$..." -> 12), or None."""
+    if not is_hashed(stored):
+        return None
+    try:
+        return int(stored.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(stored: str) -> bool:
+    """True for plain-text PINs and hashes made with a different work factor."""
+    return hash_rounds(stored) != BCRYPT_ROUNDS
+
+
+def _hashpw(pin: str) -> str:
+    return bcrypt.hashpw(pin.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
+
+
+def _checkpw(plain: str, stored: str) -> bool:
+    try:
+        return bcrypt.checkpw(plain.encode("utf-8"), stored.encode("utf-8"))
+    except ValueError:
+        return False
+
+
 def hash_pin(pin: str) -> str:
-    return bcrypt.hashpw(pin.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return _run(_hashpw, pin)
 
 
 def verify_pin(plain: str, stored: str) -> bool:
     if not stored:
         return False
     if is_hashed(stored):
-        try:
-            return bcrypt.checkpw(plain.encode("utf-8"), stored.encode("utf-8"))
-        except ValueError:
-            return False
+        return _run(_checkpw, plain, stored)
     return plain == stored
@@ -7,54 +7,36 @@ marked them as "Inspected" rather than "Replaced". Previously only "Replaced"
 touched by a job (inspected OR replaced) has its last_service_date set to the
 most recent job's completed_at date.
 
+The work is one UPDATE ... FROM per filter-id range (utility/backfill.py),
+committed per range, so it is safe to re-run and to interrupt.
+
 Run once against the production database:
-    python migrations/2026_03_13_backfill_filter_last_service_date.py
+    python migrations/2026_03_13_backfill_filter_last_service_date.py [chunk_size] [sample]
 """
 
+import sys
+
 from app import create_app
-from db import db
-from models import Filter, Job, JobFilter
-from sqlalchemy import func
+from utility.backfill import BACKFILL_CHUNK, backfill_filter_service_dates
 
 app = create_app()
 
+chunk_size = int(sys.argv[1]) if len(sys.argv) > 1 else BACKFILL_CHUNK
+sample = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+
+def report(through_id, max_id, updated):
+    print(f"  filters through id {through_id}/{max_id}: {updated} updated so far")
+
+
 with app.app_context():
-    # Find the most recent completed_at date per filter across all job_filters
-    # where the filter was either inspected or replaced.
-    latest_per_filter = (
-        db.session.query(
-            JobFilter.filter_id,
-            func.max(Job.completed_at).label("latest_completed_at")
+    result = backfill_filter_service_dates(chunk_size, sample, progress=report)
+    for row in result["sample"]:
+        print(
+            f"  Updated filter {row['filter_id']} (AHU {row['ahu_id']}): "
+            f"{row['old_date']} → {row['new_date']}"
         )
-        .join(Job, Job.id == JobFilter.job_id)
-        .filter(
-            (JobFilter.is_inspected == True) | (JobFilter.is_completed == True)
-        )
-        .group_by(JobFilter.filter_id)
-        .all()
+    print(
+        f"\nDone. {result['updated']} filter(s) updated on {result['ahus']} AHU(s) "
+        f"in {result['chunks']} chunk(s)."
     )
-
-    updated = 0
-    skipped = 0
-
-    for filter_id, latest_completed_at in latest_per_filter:
-        f = db.session.get(Filter, filter_id)
-        if f is None:
-            continue
-
-        latest_date = latest_completed_at.date()
-
-        # Only update if the job date is more recent than the stored date
-        if f.last_service_date is None or latest_date > f.last_service_date:
-            old_date = f.last_service_date
-            f.last_service_date = latest_date
-            updated += 1
-            print(
-                f"  Updated filter {filter_id} (AHU {f.ahu_id}): "
-                f"{old_date} → {latest_date}"
-            )
-        else:
-            skipped += 1
-
-    db.session.commit()
-    print(f"\nDone. {updated} filter(s) updated, {skipped} already up-to-date.")
@@ -0,0 +1,43 @@
+"""
+Add a stored, indexed filters.next_due_date (last_service_date + frequency_days).
+
+Overdue / due-soon lookups become index range scans instead of recomputing the
+due date in Python for every filter.
+
+Run once:
+    python migrations/2026_10_18_add_filter_next_due_date.py
+"""
+from app import create_app
+from db import db
+from sqlalchemy import text
+
+app = create_app()
+
+with app.app_context():
+    try:
+        print("Starting migration: filters.next_due_date...")
+        db.session.execute(text("""
+            ALTER TABLE filters ADD COLUMN IF NOT EXISTS next_due_date DATE;
+        """))
+        result = db.session.execute(text("""
+            UPDATE filters
+            SET next_due_date = CASE
+                WHEN last_service_date IS NULL OR COALESCE(frequency_days, 0) = 0 THEN NULL
+                ELSE last_service_date + frequency_days
+            END;
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_filters_next_due_date
+            ON filters (next_due_date);
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_filters_active_next_due_date
+            ON filters (next_due_date, ahu_id)
+            WHERE is_active;
+        """))
+        db.session.commit()
+        print(f"Migration applied: next_due_date backfilled for {result.rowcount} filter(s).")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Migration failed: {e}")
+        raise
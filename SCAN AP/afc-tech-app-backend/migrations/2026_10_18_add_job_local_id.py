@@ -0,0 +1,30 @@
+"""
+Add jobs.local_id (client-generated offline queue id) with a unique index on
+(tech_id, local_id), so replayed job submissions resolve to the original job
+with one index probe instead of creating duplicates.
+
+Run once:
+    python migrations/2026_10_18_add_job_local_id.py
+"""
+from app import create_app
+from db import db
+from sqlalchemy import text
+
+app = create_app()
+
+with app.app_context():
+    try:
+        print("Starting migration: jobs.local_id...")
+        db.session.execute(text("""
+            ALTER TABLE jobs ADD COLUMN IF NOT EXISTS local_id VARCHAR(64);
+        """))
+        db.session.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_tech_local_id
+            ON jobs (tech_id, local_id);
+        """))
+        db.session.commit()
+        print("Migration applied: jobs.local_id + ux_jobs_tech_local_id.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Migration failed: {e}")
+        raise
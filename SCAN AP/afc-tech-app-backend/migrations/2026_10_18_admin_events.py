@@ -0,0 +1,36 @@
+"""
+Create admin_events: the change feed behind GET /admin/events (SSE).
+Rows are written in the same transaction as the job / notification / filter
+change they describe; the id is the client's Last-Event-ID cursor. Rows
+older than ADMIN_EVENT_RETENTION_DAYS are pruned by the app.
+
+Run once:
+    python migrations/2026_10_18_admin_events.py
+"""
+from app import create_app
+from db import db
+from sqlalchemy import text
+
+app = create_app()
+
+with app.app_context():
+    try:
+        print("Starting migration: admin_events...")
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS admin_events (
+                id SERIAL PRIMARY KEY,
+                kind VARCHAR(40) NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_admin_events_created_at
+            ON admin_events (created_at);
+        """))
+        db.session.commit()
+        print("Migration applied: admin_events created.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Migration failed: {e}")
+        raise
@@ -0,0 +1,26 @@
+"""
+Index the AHU list sort key so /ahus and /admin/ahus keyset pages are
+index range scans: (hospital_id, COALESCE(excel_order, 2147483647), id).
+
+Run once:
+    python migrations/2026_10_18_ahu_list_indexes.py
+"""
+from app import create_app
+from db import db
+from sqlalchemy import text
+
+app = create_app()
+
+with app.app_context():
+    try:
+        print("Starting migration: AHU list indexes...")
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_ahus_list_order
+            ON ahus (hospital_id, COALESCE(excel_order, 2147483647), id);
+        """))
+        db.session.commit()
+        print("Migration applied: ix_ahus_list_order created.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Migration failed: {e}")
+        raise
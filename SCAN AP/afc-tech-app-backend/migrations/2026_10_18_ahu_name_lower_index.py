@@ -0,0 +1,25 @@
+"""
+Index lower(ahus.name) so legacy label scans ("AHU-001" stickers) resolve
+through an index instead of a sequential scan. See utility/ahu_resolver.py.
+
+Run once:
+    python migrations/2026_10_18_ahu_name_lower_index.py
+"""
+from app import create_app
+from db import db
+from sqlalchemy import text
+
+app = create_app()
+
+with app.app_context():
+    try:
+        print("Starting migration: ahus lower(name) index...")
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_ahus_name_lower ON ahus (lower(name));
+        """))
+        db.session.commit()
+        print("Migration applied: ix_ahus_name_lower created.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Migration failed: {e}")
+        raise
@@ -0,0 +1,52 @@
+"""
+Create ahu_status_rollup: one row per AHU with filter counts, earliest
+next-due, latest service and the last job id. Maintained by utility.rollup
+on every job / filter write; dashboards read it instead of re-aggregating.
+
+Requires 2026_10_18_add_filter_next_due_date.py to have run first.
+
+Run once:
+    python migrations/2026_10_18_ahu_status_rollup.py
+"""
+from app import create_app
+from db import db
+from sqlalchemy import text
+from utility.rollup import refresh_ahu_rollups
+
+app = create_app()
+
+with app.app_context():
+    try:
+        print("Starting migration: ahu_status_rollup...")
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS ahu_status_rollup (
+                ahu_id INTEGER PRIMARY KEY REFERENCES ahus(id) ON DELETE CASCADE,
+                filters_count INTEGER NOT NULL DEFAULT 0,
+                overdue_count INTEGER NOT NULL DEFAULT 0,
+                due_soon_count INTEGER NOT NULL DEFAULT 0,
+                min_next_due DATE,
+                last_serviced DATE,
+                last_job_id INTEGER REFERENCES jobs(id) ON DELETE SET NULL,
+                computed_on DATE NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_ahu_status_rollup_min_next_due
+            ON ahu_status_rollup (min_next_due);
+        """))
+
+        count = refresh_ahu_rollups()
+        db.session.flush()
+        db.session.execute(text("""
+            UPDATE ahu_status_rollup r
+            SET last_job_id = j.last_job_id
+            FROM (SELECT ahu_id, MAX(id) AS last_job_id FROM jobs GROUP BY ahu_id) j
+            WHERE j.ahu_id = r.ahu_id;
+        """))
+        db.session.commit()
+        print(f"Migration applied: ahu_status_rollup populated for {count} AHU(s).")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Migration failed: {e}")
+        raise
@@ -0,0 +1,47 @@
+"""
+Indexes for job date-window queries (changeout counts, packing slips).
+
+Those routes now compare jobs.completed_at against half-open timestamp
+ranges instead of DATE(completed_at), so these composite indexes can be used:
+  - jobs (ahu_id, completed_at)
+  - jobs (tech_id, completed_at)
+  - job_filters (filter_id, job_id)
+  - job_filters (job_id, filter_id) WHERE is_completed
+
+Run once:
+    python migrations/2026_10_18_job_window_indexes.py
+"""
+from app import create_app
+from db import db
+from sqlalchemy import text
+
+app = create_app()
+
+with app.app_context():
+    try:
+        print("Starting migration: job window indexes...")
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_jobs_ahu_completed_at
+            ON jobs (ahu_id, completed_at);
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_jobs_tech_completed_at
+            ON jobs (tech_id, completed_at);
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_job_filters_filter_job
+            ON job_filters (filter_id, job_id);
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_job_filters_completed_job_filter
+            ON job_filters (job_id, filter_id)
+            WHERE is_completed;
+        """))
+        db.session.execute(text("ANALYZE jobs;"))
+        db.session.execute(text("ANALYZE job_filters;"))
+        db.session.commit()
+        print("Migration applied: job window indexes created.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Migration failed: {e}")
+        raise
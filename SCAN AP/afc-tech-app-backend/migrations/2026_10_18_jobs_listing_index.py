@@ -0,0 +1,26 @@
+"""
+Index jobs (completed_at, id) for the keyset-paginated job listings
+(GET /jobs and GET /admin/jobs ordered newest first).
+
+Run once:
+    python migrations/2026_10_18_jobs_listing_index.py
+"""
+from app import create_app
+from db import db
+from sqlalchemy import text
+
+app = create_app()
+
+with app.app_context():
+    try:
+        print("Starting migration: jobs listing index...")
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_jobs_completed_at_id
+            ON jobs (completed_at, id);
+        """))
+        db.session.commit()
+        print("Migration applied: ix_jobs_completed_at_id created.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Migration failed: {e}")
+        raise
@@ -0,0 +1,26 @@
+"""
+Index notifications (status, created_at) for the paginated notifications
+feed (?status=pending, newest first) and the per-status badge counts.
+
+Run once:
+    python migrations/2026_10_18_notifications_status_index.py
+"""
+from app import create_app
+from db import db
+from sqlalchemy import text
+
+app = create_app()
+
+with app.app_context():
+    try:
+        print("Starting migration: notifications status index...")
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_notifications_status_created_at
+            ON notifications (status, created_at);
+        """))
+        db.session.commit()
+        print("Migration applied: ix_notifications_status_created_at created.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Migration failed: {e}")
+        raise
@@ -0,0 +1,75 @@
+"""
+Create supervisor_signoff_jobs, the normalized form of the comma-separated
+SupervisorSignoff.job_ids, and convert the existing signoffs into it.
+
+Only ids that are jobs of the signoff's hospital are linked; anything else
+in the free-text field is reported and left out. Safe to re-run: existing
+links are skipped.
+
+Run once:
+    python migrations/2026_10_18_supervisor_signoff_jobs.py
+"""
+from app import create_app
+from db import db
+from models import SupervisorSignoff, SupervisorSignoffJob
+from sqlalchemy import text
+from utility.signoffs import link_signoff_jobs, parse_job_ids
+
+# Signoffs converted per commit
+CHUNK = 500
+
+app = create_app()
+
+with app.app_context():
+    try:
+        print("Starting migration: supervisor_signoff_jobs...")
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS supervisor_signoff_jobs (
+                signoff_id INTEGER NOT NULL REFERENCES supervisor_signoffs(id) ON DELETE CASCADE,
+                job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+                PRIMARY KEY (signoff_id, job_id)
+            );
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_supervisor_signoff_jobs_job_signoff
+            ON supervisor_signoff_jobs (job_id, signoff_id);
+        """))
+        db.session.commit()
+        print("Table and index ready.")
+
+        already = {
+            signoff_id
+            for (signoff_id,) in db.session.query(SupervisorSignoffJob.signoff_id).distinct()
+        }
+        last_id, converted, linked, dropped = 0, 0, 0, 0
+        while True:
+            rows = (
+                db.session.query(SupervisorSignoff.id, SupervisorSignoff.hospital_id, SupervisorSignoff.job_ids)
+                .filter(SupervisorSignoff.id > last_id)
+                .order_by(SupervisorSignoff.id)
+                .limit(CHUNK)
+                .all()
+            )
+            if not rows:
+                break
+            for signoff_id, hospital_id, raw in rows:
+                if signoff_id in already:
+                    continue
+                wanted = parse_job_ids(raw)
+                done = link_signoff_jobs(signoff_id, hospital_id, wanted)
+                converted += 1
+                linked += len(done)
+                if len(done) != len(wanted):
+                    dropped += len(wanted) - len(done)
+                    print(f"  Signoff {signoff_id}: not jobs of hospital {hospital_id}: "
+                          f"{sorted(set(wanted) - set(done))}")
+            db.session.commit()
+            last_id = rows[-1][0]
+            print(f"  ...signoffs through id {last_id}")
+
+        print(f"Migration applied: {converted} signoff(s) converted, {linked} job link(s), "
+              f"{dropped} id(s) skipped.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Migration failed: {e}")
+        raise
@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy import (
-    Column, String, Integer, Text, Float, Date, DateTime, Boolean, ForeignKey, Text
+    Column, String, Integer, Text, Float, Date, DateTime, Boolean, ForeignKey, Index, Text, func
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from db import db
 
 # -------------------------
@@ -34,6 +34,9 @@ class Hospital(db.Model):
 # -------------------------
 # AHU
 # -------------------------
+AHU_ORDER_LAST = 2147483647  # sorts AHUs without excel_order after ordered ones
+
+
 class AHU(db.Model):
     __tablename__ = "ahus"
     id = Column(Integer, primary_key=True)  # QR CODE = ID
@@ -49,6 +52,56 @@ class AHU(db.Model):
     building = relationship("Building", back_populates="ahus")
     filters = relationship("Filter", back_populates="ahu", cascade="all, delete-orphan")
     jobs = relationship("Job", back_populates="ahu", cascade="all, delete-orphan")
+    status_rollup = relationship(
+        "AHUStatusRollup",
+        uselist=False,
+        back_populates="ahu",
+        cascade="all, delete-orphan"
+    )
+
+    # List order: hospital, spreadsheet order (unordered rows last), id
+    __table_args__ = (
+        Index(
+            "ix_ahus_list_order",
+            hospital_id,
+            func.coalesce(excel_order, AHU_ORDER_LAST),
+            id,
+        ),
+        # Legacy label lookups ("AHU-001" stickers), see utility.ahu_resolver
+        Index("ix_ahus_name_lower", func.lower(name)),
+    )
+
+    @classmethod
+    def list_order_key(cls):
+        return (cls.hospital_id, func.coalesce(cls.excel_order, AHU_ORDER_LAST), cls.id)
+
+
+# -------------------------
+# AHU STATUS ROLLUP
+# -------------------------
+class AHUStatusRollup(db.Model):
+    """
+    One row per AHU summarizing its active filters; maintained by
+    utility.rollup on every write that changes them. Counts are valid for
+    `computed_on`; the daily rollover pass refreshes them.
+    """
+    __tablename__ = "ahu_status_rollup"
+
+    ahu_id = Column(Integer, ForeignKey("ahus.id", ondelete="CASCADE"), primary_key=True)
+    filters_count = Column(Integer, default=0, nullable=False)
+    overdue_count = Column(Integer, default=0, nullable=False)
+    due_soon_count = Column(Integer, default=0, nullable=False)
+    min_next_due = Column(Date)
+    last_serviced = Column(Date)
+    last_job_id = Column(Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True)
+    computed_on = Column(Date, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    ahu = relationship("AHU", back_populates="status_rollup")
+
+    __table_args__ = (
+        Index("ix_ahu_status_rollup_min_next_due", "min_next_due"),
+    )
 
 
 # -------------------------
@@ -90,10 +143,37 @@ class Notification(db.Model):
     job = relationship("Job")
     technician = relationship("Technician")
 
+    __table_args__ = (
+        Index("ix_notifications_status_created_at", "status", "created_at"),
+    )
+
+
+# -------------------------
+# ADMIN EVENTS (change feed for GET /admin/events)
+# -------------------------
+class AdminEvent(db.Model):
+    __tablename__ = "admin_events"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(40), nullable=False)  # job.created, notification.created, ...
+    payload = Column(Text, nullable=False)  # compact JSON
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_admin_events_created_at", "created_at"),
+    )
+
 
 # -------------------------
 # FILTER
 # -------------------------
+def compute_next_due_date(last_service_date, frequency_days):
+    """last_service_date + frequency_days, or None when either is missing."""
+    if not last_service_date or not frequency_days:
+        return None
+    return last_service_date + timedelta(days=int(frequency_days))
+
+
 class Filter(db.Model):
     __tablename__ = "filters"
 
@@ -109,6 +189,8 @@ class Filter(db.Model):
     # ✅ SERVICE LOGIC BELONGS HERE
     frequency_days = Column(Integer, nullable=False)
     last_service_date = Column(Date)
+    # Stored last_service_date + frequency_days; call sync_next_due_date() on every write
+    next_due_date = Column(Date)
 
     excel_order = Column(Integer, nullable=True)
 
@@ -119,6 +201,21 @@ class Filter(db.Model):
         cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index("ix_filters_next_due_date", "next_due_date"),
+        Index(
+            "ix_filters_active_next_due_date",
+            "next_due_date",
+            "ahu_id",
+            postgresql_where=is_active.is_(True),
+            sqlite_where=is_active.is_(True),
+        ),
+    )
+
+    def sync_next_due_date(self):
+        self.next_due_date = compute_next_due_date(self.last_service_date, self.frequency_days)
+        return self.next_due_date
+
 # -------------------------
 # TECHNICIAN
 # -------------------------
@@ -148,6 +245,8 @@ class Job(db.Model):
     overall_notes = Column(Text)
     gps_lat = Column(Float)
     gps_long = Column(Float)
+    # Client-generated id of an offline-queued job; replays return the original
+    local_id = Column(String(64), nullable=True)
 
     ahu = relationship("AHU", back_populates="jobs")
     technician = relationship("Technician", back_populates="jobs")
@@ -159,6 +258,13 @@ class Job(db.Model):
         cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index("ux_jobs_tech_local_id", "tech_id", "local_id", unique=True),
+        Index("ix_jobs_ahu_completed_at", "ahu_id", "completed_at"),
+        Index("ix_jobs_tech_completed_at", "tech_id", "completed_at"),
+        Index("ix_jobs_completed_at_id", "completed_at", "id"),
+    )
+
 
 # -------------------------
 # JOB FILTERS
@@ -178,6 +284,18 @@ class JobFilter(db.Model):
     job = relationship("Job", back_populates="job_filters")
     filter = relationship("Filter", back_populates="job_filters")
 
+    __table_args__ = (
+        Index("ix_job_filters_filter_job", "filter_id", "job_id"),
+        # Packing slips join jobs in a window to their completed rows only
+        Index(
+            "ix_job_filters_completed_job_filter",
+            "job_id",
+            "filter_id",
+            postgresql_where=is_completed.is_(True),
+            sqlite_where=is_completed.is_(True),
+        ),
+    )
+
 #added a "inspected" checbox
 
 
@@ -191,7 +309,9 @@ class JobSignature(db.Model):
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
     signer_name = Column(String(150))
     signer_role = Column(String(100))
-    signature_data = Column(Text, nullable=False)
+    # base64 PNG (up to 500 KB); deferred so touching job.signature stays cheap.
+    # Served as an image by GET /jobs/<job_id>/signature.png
+    signature_data = deferred(Column(Text, nullable=False))
     created_at = Column(DateTime, default=datetime.utcnow)
 
     job = relationship("Job", back_populates="signature")
@@ -208,8 +328,25 @@ class SupervisorSignoff(db.Model):
     date = Column(Date, nullable=False)
     supervisor_name = Column(String(150), nullable=False)
     summary = Column(Text)
-    signature_data = Column(Text, nullable=False)  # base64 PNG
-    job_ids = Column(Text)  # Comma-separated job IDs for simplicity
+    # base64 PNG; deferred out of list queries, served by GET /signatures/<id>.png
+    signature_data = deferred(Column(Text, nullable=False))
+    # Comma-separated job IDs as submitted; supervisor_signoff_jobs is the queryable form
+    job_ids = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     hospital = relationship("Hospital")
+
+
+class SupervisorSignoffJob(db.Model):
+    """One row per job covered by a supervisor signoff."""
+    __tablename__ = "supervisor_signoff_jobs"
+
+    signoff_id = Column(
+        Integer, ForeignKey("supervisor_signoffs.id", ondelete="CASCADE"), primary_key=True
+    )
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        # The primary key serves signoff -> jobs; this serves "is job X signed off"
+        Index("ix_supervisor_signoff_jobs_job_signoff", "job_id", "signoff_id"),
+    )
@@ -1,13 +1,23 @@
-from flask import Blueprint, jsonify, request
-from models import Hospital, AHU, Job, Technician, Filter, JobFilter
+from flask import Blueprint, Response, current_app, g, jsonify, request, stream_with_context, url_for
+from models import Hospital, AHU, AHUStatusRollup, Job, Technician, Filter, JobFilter
 from models import SupervisorSignoff
 from db import db
-from sqlalchemy.orm import joinedload
-from sqlalchemy import func
+from extensions import limiter
+from sqlalchemy import case, func, tuple_
+import json
 import re
 from datetime import datetime, date
-from middleware.auth import require_admin
+from middleware.auth import require_admin, require_admin_stream
+from middleware.jwt_utils import create_stream_token, token_string
 from utility.http import internal_error, validate_signature_payload
+from utility.backfill import BACKFILL_CHUNK, backfill_filter_service_dates
+from utility.cache import overview_cache, packing_slip_cache, qr_payload_cache
+from utility.daterange import within_days
+from utility.events import AdminEventCursor, emit_admin_event
+from utility.pagination import decode_cursor, encode_cursor, parse_limit
+from utility.rollup import refresh_ahu_rollups, roll_over_ahu_rollups
+from utility.signoffs import link_signoff_jobs, parse_job_ids
+from utility.status import due_soon_clause, overdue_clause
 import subprocess
 import time
 import os
@@ -63,8 +73,10 @@ def create_supervisor_signoff():
             job_ids=job_ids_str
         )
         db.session.add(new_signoff)
+        db.session.flush()
+        linked = link_signoff_jobs(new_signoff.id, new_signoff.hospital_id, parse_job_ids(job_ids))
         db.session.commit()
-        return jsonify({"id": new_signoff.id}), 201
+        return jsonify({"id": new_signoff.id, "linked_job_ids": linked}), 201
     except Exception as e:
         db.session.rollback()
         print(f"Error creating supervisor signoff: {e}")
@@ -74,7 +86,10 @@ def create_supervisor_signoff():
 @admin_bp.route("/supervisor-signoff", methods=["GET"])
 @require_admin
 def get_supervisor_signoffs():
-    """Get supervisor signoff records, optionally filtered by hospital_id and/or date."""
+    """
+    Get supervisor signoff records, optionally filtered by hospital_id and/or date.
+    Signatures are not inlined; each record links to its image (signature_url).
+    """
     try:
         hospital_id = request.args.get("hospital_id")
         date_str = request.args.get("date")
@@ -96,7 +111,7 @@ def get_supervisor_signoffs():
                 "date": s.date.isoformat(),
                 "supervisor_name": s.supervisor_name,
                 "summary": s.summary,
-                "signature_data": s.signature_data,
+                "signature_url": url_for("signature.get_signoff_signature", signoff_id=s.id),
                 "job_ids": s.job_ids,
                 "created_at": s.created_at.isoformat() if s.created_at else None
             })
@@ -232,6 +247,7 @@ def update_hospital(hospital_id):
                     return jsonify({"error": "contract_year_end must be YYYY-MM-DD"}), 400
 
         db.session.commit()
+        qr_payload_cache.clear()  # scan payloads embed hospital_name
         return jsonify(_hospital_settings_dict(h)), 200
     except Exception as e:
         db.session.rollback()
@@ -242,54 +258,242 @@ def update_hospital(hospital_id):
 @admin_bp.route("/overview", methods=["GET"])
 @require_admin
 def admin_overview():
-    hospitals = Hospital.query.all()
+    """
+    Fleet totals and per-hospital AHU status counts, read from the status
+    rollup with two aggregate queries and cached for a few seconds.
+    """
+    try:
+        today = date.today()
+        cached = overview_cache.get(today)
+        if cached is None:
+            cached = _fleet_overview(today)
+            overview_cache.set(today, cached)
+        return jsonify(cached), 200
+    except Exception as e:
+        db.session.rollback()
+        return internal_error(e)
 
-    total_hospitals = len(hospitals)
-    total_ahus = 0
-    overdue = 0
-    due_soon = 0
-    completed = 0
-    pending = 0
 
-    return jsonify({
-        "hospitals": total_hospitals,
-        "total_ahus": total_ahus,
-        "overdue": overdue,
-        "due_soon": due_soon,
-        "completed": completed,
-        "pending": pending
-    }), 200
+def _fleet_overview(today):
+    roll_over_ahu_rollups(today)
+    min_due = AHUStatusRollup.min_next_due
+    counts = (
+        db.session.query(
+            AHU.hospital_id,
+            func.count(AHU.id),
+            func.sum(case((overdue_clause(min_due, today), 1), else_=0)),
+            func.sum(case((due_soon_clause(min_due, today), 1), else_=0)),
+            func.sum(case((min_due.is_(None), 1), else_=0)),
+        )
+        .outerjoin(AHUStatusRollup, AHUStatusRollup.ahu_id == AHU.id)
+        .group_by(AHU.hospital_id)
+        .all()
+    )
+    by_id = {}
+    for hospital_id, total, overdue, due_soon, pending in counts:
+        total, overdue, due_soon, pending = (int(v or 0) for v in (total, overdue, due_soon, pending))
+        by_id[hospital_id] = {
+            "total_ahus": total,
+            "overdue": overdue,
+            "due_soon": due_soon,
+            "completed": total - overdue - due_soon - pending,
+            "pending": pending,
+        }
+
+    empty = {"total_ahus": 0, "overdue": 0, "due_soon": 0, "completed": 0, "pending": 0}
+    hospitals = db.session.query(Hospital.id, Hospital.name).order_by(Hospital.name.asc()).all()
+    overview = {"hospitals": len(hospitals), **empty}
+    for stats in by_id.values():
+        for key in empty:
+            overview[key] += stats[key]
+    overview["by_hospital"] = [
+        {"hospital_id": hid, "name": name, **by_id.get(hid, empty)}
+        for hid, name in hospitals
+    ]
+    return overview
 
 
 @admin_bp.route("/notifications", methods=["GET"])
 @require_admin
 def list_notifications():
+    """
+    Newest first, names joined in the same query. Optional `status`
+    (pending / completed). Without `limit` or `cursor` the full list is
+    returned as a bare array; with either, one page keyed on
+    (created_at, id) as {"data", "next_cursor"}.
+    """
     from models import Notification
     try:
-        notifs = Notification.query.order_by(Notification.created_at.desc()).all()
+        args = request.args
+        q = (
+            db.session.query(
+                Notification.id, Notification.hospital_id, Hospital.name,
+                Notification.ahu_id, AHU.name, Notification.job_id,
+                Notification.technician_id, Technician.name,
+                Notification.comment_text, Notification.status,
+                Notification.created_at, Notification.resolved_at,
+                Notification.resolved_by,
+            )
+            .outerjoin(Hospital, Hospital.id == Notification.hospital_id)
+            .outerjoin(AHU, AHU.id == Notification.ahu_id)
+            .outerjoin(Technician, Technician.id == Notification.technician_id)
+        )
+        if args.get("status"):
+            q = q.filter(Notification.status == args["status"])
+        q = q.order_by(Notification.created_at.desc(), Notification.id.desc())
+
+        paged = "limit" in args or "cursor" in args
+        if paged:
+            try:
+                limit = parse_limit(args.get("limit"), default=50, maximum=500)
+                if args.get("cursor"):
+                    created_at, notif_id = decode_cursor(args["cursor"], 2)
+                    try:
+                        after = (datetime.fromisoformat(created_at), int(notif_id))
+                    except (TypeError, ValueError):
+                        raise ValueError("Invalid cursor")
+                    q = q.filter(
+                        tuple_(Notification.created_at, Notification.id) < tuple_(*after)
+                    )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            rows = q.limit(limit + 1).all()
+        else:
+            rows = q.all()
+
         result = []
-        for n in notifs:
+        for (notif_id, hospital_id, hospital_name, ahu_id, ahu_name, job_id,
+             technician_id, technician_name, comment_text, status, created_at,
+             resolved_at, resolved_by) in rows:
             result.append({
-                "id": n.id,
-                "hospital_id": n.hospital_id,
-                "hospital_name": n.hospital.name if n.hospital else None,
-                "ahu_id": n.ahu_id,
-                "ahu_name": n.ahu.name if n.ahu else None,
-                "job_id": n.job_id,
-                "technician_id": n.technician_id,
-                "technician_name": n.technician.name if n.technician else None,
-                "comment_text": n.comment_text,
-                "status": n.status,
-                "created_at": n.created_at.isoformat() if n.created_at else None,
-                "resolved_at": n.resolved_at.isoformat() if n.resolved_at else None,
-                "resolved_by": n.resolved_by
+                "id": notif_id,
+                "hospital_id": hospital_id,
+                "hospital_name": hospital_name,
+                "ahu_id": ahu_id,
+                "ahu_name": ahu_name,
+                "job_id": job_id,
+                "technician_id": technician_id,
+                "technician_name": technician_name,
+                "comment_text": comment_text,
+                "status": status,
+                "created_at": created_at.isoformat() if created_at else None,
+                "resolved_at": resolved_at.isoformat() if resolved_at else None,
+                "resolved_by": resolved_by
             })
-        return jsonify(result), 200
+        if not paged:
+            return jsonify(result), 200
+
+        next_cursor = None
+        if len(result) > limit:
+            result = result[:limit]
+            next_cursor = encode_cursor([result[-1]["created_at"], result[-1]["id"]])
+        return jsonify({"data": result, "next_cursor": next_cursor}), 200
     except Exception as e:
         print(f"Error listing notifications: {e}")
         return internal_error(e)
 
 
+# The dashboard badge polls counts and every open panel re-fetches a stream
+# token on each reconnect; the default 300/hour per technician would cut an
+# admin off within the hour, so these get their own budget.
+ADMIN_POLL_RATE_LIMIT = os.getenv("ADMIN_POLL_RATE_LIMIT", "1200 per hour")
+
+
+@admin_bp.route("/notifications/counts", methods=["GET"])
+@limiter.limit(ADMIN_POLL_RATE_LIMIT)
+@require_admin
+def notification_counts():
+    """Per-status counts for the dashboard badge (one GROUP BY, no rows)."""
+    from models import Notification
+    try:
+        counts = dict(
+            db.session.query(Notification.status, func.count(Notification.id))
+            .group_by(Notification.status)
+            .all()
+        )
+        return jsonify({
+            "pending": int(counts.get("pending", 0)),
+            "completed": int(counts.get("completed", 0)),
+            "total": int(sum(counts.values())),
+        }), 200
+    except Exception as e:
+        print(f"Error counting notifications: {e}")
+        return internal_error(e)
+
+
+# SSE change feed tuning: poll interval, idle heartbeat and how long one
+# connection is held before the client is asked to reconnect (and resume)
+# A stream occupies one gthread thread (gunicorn.conf.py) for its lifetime.
+# Each connection ends after SSE_MAX_SECONDS and EventSource reconnects from
+# Last-Event-ID, so keep it below gunicorn's timeout (30s) or the worker is
+# killed mid-stream.
+SSE_POLL_SECONDS = float(os.getenv("SSE_POLL_SECONDS", "2"))
+SSE_HEARTBEAT_SECONDS = 10
+SSE_MAX_SECONDS = float(os.getenv("SSE_MAX_SECONDS", "25"))
+
+
+@admin_bp.route("/events/token", methods=["POST"])
+@limiter.limit(ADMIN_POLL_RATE_LIMIT)
+@require_admin
+def admin_events_token():
+    """Short-lived token for GET /admin/events?access_token= (only valid there)."""
+    token = token_string(create_stream_token(g.current_tech_id, g.current_tech_role))
+    return jsonify({
+        "token": token,
+        "expires_in": int(current_app.config.get("SSE_TOKEN_SECONDS", 300)),
+    }), 200
+
+
+# Exempt from the default limit: callers already hold a stream token from the
+# limited /events/token, and a reconnect comes at most every SSE_MAX_SECONDS
+@admin_bp.route("/events", methods=["GET"])
+@limiter.exempt
+@require_admin_stream
+def admin_events():
+    """
+    Server-sent events: job.created, notification.created,
+    notification.updated and filter.updated. Resumes after the
+    Last-Event-ID header (or ?last_event_id=); otherwise starts at "now".
+    The SSE id is a resume point, not the event id: after a reconnect an
+    event may be repeated, so clients de-duplicate on data.id.
+    """
+    raw = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        cursor = AdminEventCursor(int(raw)) if raw else AdminEventCursor.starting_now()
+    except ValueError:
+        return jsonify({"error": "Invalid Last-Event-ID"}), 400
+    finally:
+        # Don't hold a pooled connection for the life of the stream
+        db.session.close()
+
+    def stream(cursor):
+        yield "retry: 3000\n\n"
+        started = last_beat = time.monotonic()
+        while time.monotonic() - started < SSE_MAX_SECONDS:
+            try:
+                events = cursor.poll(time.monotonic())
+            finally:
+                db.session.close()
+            for event_id, kind, payload, created_at in events:
+                data = json.dumps({**json.loads(payload), "id": event_id, "kind": kind,
+                                   "at": created_at.isoformat()})
+                # Everything up to this id is delivered (events arrive in id order)
+                yield f"id: {min(cursor.position, event_id)}\nevent: {kind}\ndata: {data}\n\n"
+            now = time.monotonic()
+            if events:
+                last_beat = now
+            elif now - last_beat >= SSE_HEARTBEAT_SECONDS:
+                yield ": keepalive\n\n"
+                last_beat = now
+            time.sleep(SSE_POLL_SECONDS)
+
+    return Response(
+        stream_with_context(stream(cursor)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @admin_bp.route("/notifications/<int:notif_id>/status", methods=["POST"])
 @require_admin
 def update_notification_status(notif_id):
@@ -312,6 +516,7 @@ def update_notification_status(notif_id):
             notif.resolved_at = None
             notif.resolved_by = None
 
+        emit_admin_event("notification.updated", notification_id=notif.id, status=notif.status)
         db.session.commit()
         return jsonify({"message": "Notification updated"}), 200
     except Exception as e:
@@ -323,39 +528,10 @@ def update_notification_status(notif_id):
 @admin_bp.route("/jobs", methods=["GET"])
 @require_admin
 def get_all_jobs():
-    print("DEBUG: get_all_jobs called with is_inspected support - VERSION 2")  # Debug log
-    # Updated to include is_inspected
-    jobs = db.session.query(Job).options(
-        joinedload(Job.technician),
-        joinedload(Job.ahu),
-        joinedload(Job.job_filters).joinedload('filter')
-    ).all()
-
-    result = []
-    for job in jobs:
-        result.append({
-            "id": job.id,
-            "ahu_id": job.ahu_id,
-            "ahu_name": job.ahu.name if job.ahu else "Unknown AHU",
-            "technician": job.technician.name if job.technician else "Unknown Tech",
-            "completed_at": job.completed_at.isoformat() + "Z",
-            "overall_notes": job.overall_notes,
-            "gps_lat": job.gps_lat,
-            "gps_long": job.gps_long,
-            "filters": [
-                {
-                    "phase": jf.filter.phase,
-                    "part_number": jf.filter.part_number,
-                    "size": jf.filter.size,
-                    "is_completed": jf.is_completed,
-                    "is_inspected": jf.is_inspected,
-                    "note": jf.note
-                }
-                for jf in job.job_filters
-            ]
-        })
-
-    return jsonify(result), 200
+    # Same URL as job_bp's /admin/jobs (registered first): one implementation,
+    # paginated and filtered in SQL
+    from routes.job_routes import _job_list_response
+    return _job_list_response()
 
 
 @admin_bp.route("/ahu", methods=["POST"])
@@ -391,6 +567,8 @@ def create_ahu():
             notes=final_notes,
         )
         db.session.add(new_ahu)
+        db.session.flush()
+        refresh_ahu_rollups([new_ahu.id])
         db.session.commit()  # commit to get autoincremented id
 
         # If no explicit name provided, set a human-friendly label using the new numeric id
@@ -558,44 +736,28 @@ def backfill_filter_dates():
     Retroactively update Filter.last_service_date for every filter that was
     inspected or replaced in a past job but whose stored date is out of date.
 
-    For each filter, the most recent Job.completed_at among all JobFilter rows
-    where is_inspected=True OR is_completed=True is used as the new
-    last_service_date (only when that date is more recent than the stored one).
+    Runs the set-based pass in utility/backfill.py, committing per filter-id
+    range. Optional JSON/query params: chunk_size (default 5000) and sample
+    (number of changed rows to echo back, max 500; default 0).
+    Returns counts rather than the full change list.
     """
     try:
-        latest_per_filter = (
-            db.session.query(
-                JobFilter.filter_id,
-                func.max(Job.completed_at).label("latest_completed_at")
-            )
-            .join(Job, Job.id == JobFilter.job_id)
-            .filter(
-                (JobFilter.is_inspected == True) | (JobFilter.is_completed == True)
-            )
-            .group_by(JobFilter.filter_id)
-            .all()
-        )
+        body = request.get_json(silent=True) or {}
+        try:
+            chunk_size = int(body.get("chunk_size", request.args.get("chunk_size", BACKFILL_CHUNK)))
+            sample = int(body.get("sample", request.args.get("sample", 0)))
+        except (TypeError, ValueError):
+            return jsonify({"error": "chunk_size and sample must be integers"}), 400
+        if chunk_size < 1 or sample < 0:
+            return jsonify({"error": "chunk_size must be >= 1 and sample >= 0"}), 400
 
-        updated = []
-        for filter_id, latest_completed_at in latest_per_filter:
-            f = db.session.get(Filter, filter_id)
-            if f is None:
-                continue
-            latest_date = latest_completed_at.date()
-            if f.last_service_date is None or latest_date > f.last_service_date:
-                old_date = f.last_service_date.isoformat() if f.last_service_date else None
-                f.last_service_date = latest_date
-                updated.append({
-                    "filter_id": filter_id,
-                    "ahu_id": f.ahu_id,
-                    "old_date": old_date,
-                    "new_date": latest_date.isoformat()
-                })
+        def report(through_id, max_id, updated):
+            logger.info(f"backfill_filter_dates: filters through id {through_id}/{max_id}, {updated} updated")
 
-        db.session.commit()
+        result = backfill_filter_service_dates(chunk_size, sample, progress=report)
         return jsonify({
-            "message": f"{len(updated)} filter(s) updated",
-            "updated": updated
+            "message": f"{result['updated']} filter(s) updated",
+            **result
         }), 200
     except Exception as e:
         db.session.rollback()
@@ -603,17 +765,151 @@ def backfill_filter_dates():
         return internal_error(e)
 
 
+PACKING_SLIP_MODES = ("lines", "aggregate")
+
+
+def _packing_slip_latest(hospital_id, start, end):
+    """
+    Subquery of the newest Replaced job line per (AHU, filter) in the window:
+    job_id, completed_at, ahu_id, filter_id. ROW_NUMBER does the de-duplication
+    in the database (portable; DISTINCT ON is Postgres-only).
+    """
+    ranked = (
+        db.session.query(
+            Job.id.label("job_id"),
+            Job.completed_at.label("completed_at"),
+            Job.ahu_id.label("ahu_id"),
+            JobFilter.filter_id.label("filter_id"),
+            func.row_number().over(
+                partition_by=(Job.ahu_id, JobFilter.filter_id),
+                order_by=(Job.completed_at.desc(), Job.id.desc()),
+            ).label("rn"),
+        )
+        .select_from(JobFilter)
+        .join(Job, Job.id == JobFilter.job_id)
+        .join(AHU, AHU.id == Job.ahu_id)
+        .filter(
+            AHU.hospital_id == hospital_id,
+            JobFilter.is_completed.is_(True),
+            within_days(Job.completed_at, start, end),
+        )
+        .subquery()
+    )
+    return (
+        db.session.query(ranked.c.job_id, ranked.c.completed_at, ranked.c.ahu_id, ranked.c.filter_id)
+        .filter(ranked.c.rn == 1)
+        .subquery()
+    )
+
+
+def _packing_slip_stamp(hospital_id, start, end):
+    """
+    (count, max id) of the hospital's jobs in the window. Jobs are never
+    updated or deleted, so any job committed into the window, on any worker
+    and whatever its completed_at, changes the stamp.
+    """
+    return tuple(
+        db.session.query(func.count(Job.id), func.max(Job.id))
+        .join(AHU, AHU.id == Job.ahu_id)
+        .filter(AHU.hospital_id == hospital_id, within_days(Job.completed_at, start, end))
+        .one()
+    )
+
+
+def _packing_slip_payload(hospital_id, start, end, mode):
+    latest = _packing_slip_latest(hospital_id, start, end)
+    job_count, filter_count = db.session.query(
+        func.count(func.distinct(latest.c.job_id)), func.count()
+    ).select_from(latest).one()
+    quantity = func.coalesce(Filter.quantity, 1)
+
+    if mode == "aggregate":
+        rows = (
+            db.session.query(
+                Filter.part_number,
+                Filter.size,
+                func.sum(quantity),
+                func.count(),
+                func.count(func.distinct(latest.c.ahu_id)),
+            )
+            .select_from(latest)
+            .join(Filter, Filter.id == latest.c.filter_id)
+            .group_by(Filter.part_number, Filter.size)
+            .order_by(Filter.part_number.asc(), Filter.size.asc())
+            .all()
+        )
+        lines = [
+            {
+                "part_number": part_number,
+                "size": size,
+                "quantity": int(total or 0),
+                "filter_count": n_filters,
+                "ahu_count": n_ahus,
+            }
+            for part_number, size, total, n_filters, n_ahus in rows
+        ]
+    else:
+        rows = (
+            db.session.query(
+                latest.c.job_id,
+                latest.c.completed_at,
+                AHU.id,
+                AHU.name,
+                Filter.id,
+                Filter.part_number,
+                quantity,
+                Filter.size,
+                Filter.phase,
+            )
+            .select_from(latest)
+            .join(AHU, AHU.id == latest.c.ahu_id)
+            .join(Filter, Filter.id == latest.c.filter_id)
+            .order_by(latest.c.completed_at.desc(), AHU.id.asc(), Filter.id.asc())
+            .all()
+        )
+        lines = [
+            {
+                "job_id": job_id,
+                "completed_at": completed_at.isoformat() if completed_at else None,
+                "ahu_id": ahu_id,
+                "ahu_name": ahu_name,
+                "filter_id": filter_id,
+                "part_number": part_number,
+                "quantity": qty,
+                "size": size,
+                "phase": phase,
+            }
+            for job_id, completed_at, ahu_id, ahu_name, filter_id, part_number, qty, size, phase in rows
+        ]
+
+    return {
+        "hospital_id": hospital_id,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "mode": mode,
+        "job_count": job_count,
+        "filter_count": filter_count,
+        "line_count": len(lines),
+        "lines": lines,
+    }
+
+
 @admin_bp.route("/packing-slip/lines", methods=["GET"])
 @require_admin
 def packing_slip_lines_from_jobs():
     """
-    Lines for QB packing slip from filters marked Replaced on completed jobs.
-    Query: hospital_id (required), from=YYYY-MM-DD, to=YYYY-MM-DD
+    Lines for QB packing slip from filters marked Replaced on completed jobs,
+    one per (AHU, filter) from its newest job in the window.
+    Query: hospital_id (required), from=YYYY-MM-DD, to=YYYY-MM-DD,
+    mode=lines (default) | aggregate (quantities summed per part_number/size).
+    Cached per (hospital, from, to, mode) and a stamp of the window's jobs
+    read on every request, so new jobs show up at once on every worker.
     """
     try:
         hospital_id = request.args.get("hospital_id")
         from_str = request.args.get("from")
         to_str = request.args.get("to")
+        mode = request.args.get("mode", "lines")
 
         if not hospital_id:
             return jsonify({"error": "hospital_id is required"}), 400
@@ -623,6 +919,9 @@ def packing_slip_lines_from_jobs():
         except ValueError:
             return jsonify({"error": "Invalid hospital_id"}), 400
 
+        if mode not in PACKING_SLIP_MODES:
+            return jsonify({"error": f"mode must be one of {', '.join(PACKING_SLIP_MODES)}"}), 400
+
         if from_str:
             start = datetime.strptime(from_str, "%Y-%m-%d").date()
         else:
@@ -633,51 +932,12 @@ def packing_slip_lines_from_jobs():
         else:
             end = date.today()
 
-        rows = (
-            db.session.query(JobFilter, Job, Filter, AHU)
-            .join(Job, Job.id == JobFilter.job_id)
-            .join(Filter, Filter.id == JobFilter.filter_id)
-            .join(AHU, AHU.id == Job.ahu_id)
-            .filter(
-                AHU.hospital_id == hospital_id,
-                JobFilter.is_completed.is_(True),
-                db.func.date(Job.completed_at) >= start,
-                db.func.date(Job.completed_at) <= end,
-            )
-            .order_by(Job.completed_at.desc(), AHU.id.asc(), Filter.id.asc())
-            .all()
-        )
-
-        seen = set()
-        lines = []
-        job_ids = set()
-
-        for jf, job, filt, ahu in rows:
-            dedupe_key = (ahu.id, filt.id)
-            if dedupe_key in seen:
-                continue
-            seen.add(dedupe_key)
-            job_ids.add(job.id)
-            lines.append({
-                "job_id": job.id,
-                "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-                "ahu_id": ahu.id,
-                "ahu_name": ahu.name,
-                "filter_id": filt.id,
-                "part_number": filt.part_number,
-                "quantity": filt.quantity if filt.quantity is not None else 1,
-                "size": filt.size,
-                "phase": filt.phase,
-            })
-
-        return jsonify({
-            "hospital_id": hospital_id,
-            "from": start.isoformat(),
-            "to": end.isoformat(),
-            "job_count": len(job_ids),
-            "line_count": len(lines),
-            "lines": lines,
-        }), 200
+        key = (hospital_id, start, end, mode, _packing_slip_stamp(hospital_id, start, end))
+        payload = packing_slip_cache.get(key)
+        if payload is None:
+            payload = _packing_slip_payload(hospital_id, start, end, mode)
+            packing_slip_cache.set(key, payload)
+        return jsonify(payload), 200
     except Exception as e:
         logger.error("packing_slip_lines_from_jobs: %s", e)
         return internal_error(e)
\ No newline at end of file
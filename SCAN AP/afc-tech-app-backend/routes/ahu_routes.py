@@ -1,15 +1,29 @@
 from flask import Blueprint, jsonify, request
-from models import AHU, Filter, Technician, Job, JobFilter, Hospital
+from models import AHU, AHUStatusRollup, Building, Filter, Technician, Job, JobFilter, Hospital
 from db import db
 import traceback
 from dateutil.parser import isoparse
 from middleware.auth import require_admin, require_auth
+from utility.ahu_resolver import resolve_ahu_id
+from utility.cache import get_qr_payload, invalidate_packing_slips, invalidate_qr_payload, set_qr_payload
+from utility.events import emit_admin_event
+from utility.daterange import within_days
 from utility.http import internal_error
-from datetime import date, datetime
-
-from sqlalchemy.orm import joinedload, selectinload
-from sqlalchemy import func
-from utility.status import compute_filter_status
+from utility.pagination import decode_cursor, encode_cursor, parse_limit
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import joinedload
+from utility.rollup import refresh_ahu_rollups, roll_over_ahu_rollups
+from utility.status import (
+    DUE_SOON_DAYS,
+    ahu_status_from_min_next_due,
+    compute_ahu_statuses,
+    compute_filter_statuses,
+    due_soon_clause,
+    empty_ahu_status,
+    overdue_clause,
+)
 
 ahu_bp = Blueprint("ahu", __name__)
 
@@ -39,85 +53,174 @@ def changeout_window_for_hospital(hospital):
 
 
 # ---------------------------------------------------
-# Helper: Safe filter status wrapper
+# Helper: AHU list from the status rollup (one row per AHU)
 # ---------------------------------------------------
-def safe_filter_status(f):
-    """
-    compute_filter_status can throw if data is unexpected.
-    This wrapper ensures we never crash endpoints.
-    """
-    try:
-        st = compute_filter_status(f) or {}
-    except Exception:
-        traceback.print_exc()
-        st = {}
-
-    return {
-        "status": st.get("status"),
-        "next_due_date": st.get("next_due_date"),
-        "days_until_due": st.get("days_until_due"),
-        "days_overdue": st.get("days_overdue"),
-    }
-
-
-# ---------------------------------------------------
-# Helper: Compute AHU service status safely
-# ---------------------------------------------------
-def compute_ahu_status_from_filters(filters):
-    if not filters:
-        return {
-            "status": "Pending",
-            "next_due_date": None,
-            "days_until_due": None,
-            "days_overdue": None,
+def _ahu_list_rows(today=None):
+    """AHU list as plain row tuples: AHU columns, names and rollup counts."""
+    roll_over_ahu_rollups(today)
+    r = AHUStatusRollup
+    order_key = AHU.list_order_key()
+    return (
+        db.session.query(
+            AHU.id, AHU.hospital_id, Hospital.name, AHU.name, AHU.location,
+            AHU.notes, AHU.building_id, Building.name,
+            r.filters_count, r.overdue_count, r.due_soon_count,
+            r.min_next_due, r.last_serviced, order_key[1],
+        )
+        .outerjoin(Hospital, Hospital.id == AHU.hospital_id)
+        .outerjoin(Building, Building.id == AHU.building_id)
+        .outerjoin(r, r.ahu_id == AHU.id)
+        .order_by(*(col.asc() for col in order_key))
+    )
+
+
+def _filter_ahu_list(q, args, today):
+    """Push hospital_id / building_id / status filters into SQL."""
+    for arg, column in (("hospital_id", AHU.hospital_id), ("building_id", AHU.building_id)):
+        raw = args.get(arg)
+        if raw:
+            try:
+                q = q.filter(column == int(raw))
+            except ValueError:
+                raise ValueError(f"{arg} must be numeric")
+
+    status = args.get("status")
+    if status:
+        min_next_due = AHUStatusRollup.min_next_due
+        clauses = {
+            "overdue": overdue_clause(min_next_due, today),
+            "due_soon": due_soon_clause(min_next_due, today),
+            "completed": min_next_due > today + timedelta(days=DUE_SOON_DAYS),
+            "pending": min_next_due.is_(None),
         }
+        if status not in clauses:
+            raise ValueError("status must be one of: " + ", ".join(clauses))
+        q = q.filter(clauses[status])
+    return q
 
-    next_dues = []
-    days_until_list = []
-    overdue_days = []
-
-    for f in filters:
-        st = safe_filter_status(f)
 
-        if st["next_due_date"]:
-            next_dues.append(st["next_due_date"])
+def _ahu_list_response():
+    """
+    Shared body of /ahus and /admin/ahus.
 
-        if st["days_until_due"] is not None:
-            days_until_list.append(st["days_until_due"])
+    Without `limit` or `cursor` the whole list is returned as a bare array.
+    With either, one page ordered by (hospital_id, excel_order, id) is
+    returned as {"data", "next_cursor", "total"}.
+    """
+    args = request.args
+    today = date.today()
+    try:
+        q = _filter_ahu_list(_ahu_list_rows(today), args, today)
+        if "limit" not in args and "cursor" not in args:
+            return jsonify(_ahu_list_payload(q.all(), today)), 200
 
-        if st["days_overdue"]:
-            overdue_days.append(st["days_overdue"])
+        limit = parse_limit(args.get("limit"))
+        count_q = db.session.query(func.count(AHU.id))
+        if args.get("status"):
+            count_q = count_q.outerjoin(AHUStatusRollup, AHUStatusRollup.ahu_id == AHU.id)
+        total = _filter_ahu_list(count_q, args, today).scalar()
 
-    if not next_dues:
-        return {
-            "status": "Pending",
-            "next_due_date": None,
-            "days_until_due": None,
-            "days_overdue": None,
-        }
+        if args.get("cursor"):
+            try:
+                after = [int(v) for v in decode_cursor(args["cursor"], 3)]
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            q = q.filter(tuple_(*AHU.list_order_key()) > tuple_(*after))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    rows = q.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last[1], last[-1], last[0]])
+
+    return jsonify({
+        "data": _ahu_list_payload(rows, today),
+        "next_cursor": next_cursor,
+        "total": total,
+    }), 200
+
+
+def _ahu_list_payload(rows, today=None):
+    today = today or date.today()
+    payload = []
+    for (ahu_id, hospital_id, hospital_name, name, location, notes,
+         building_id, building_name, filters_count, overdue_count,
+         due_soon_count, min_next_due, last_serviced, _order) in rows:
+        status_data = ahu_status_from_min_next_due(min_next_due, today)
+        payload.append({
+            "id": ahu_id,
+            "hospital_id": hospital_id,
+            "hospital": hospital_name,
+            "name": name,
+            "location": location,
+            "notes": notes,
+
+            "overdue_count": int(overdue_count or 0),
+            "due_soon_count": int(due_soon_count or 0),
+            "last_serviced": last_serviced.isoformat() if last_serviced else None,
+
+            "status": status_data["status"],
+            "next_due_date": status_data["next_due_date"],
+            "days_until_due": status_data["days_until_due"],
+            "days_overdue": status_data["days_overdue"],
+
+            "filters_count": int(filters_count or 0),
+            "building_id": building_id,
+            "building": building_name,
+        })
+    return payload
 
-    if overdue_days:
-        return {
-            "status": "Overdue",
-            "next_due_date": min(next_dues),
-            "days_until_due": 0,
-            "days_overdue": max(overdue_days),
-        }
 
-    if any(d <= 7 for d in days_until_list):
-        return {
-            "status": "Due Soon",
-            "next_due_date": min(next_dues),
-            "days_until_due": min(days_until_list) if days_until_list else None,
-            "days_overdue": 0,
-        }
+# ---------------------------------------------------
+# Helper: QR scan payloads (one filter query for any number of AHUs)
+# ---------------------------------------------------
+def _qr_scan_payloads(ahus):
+    """Scan payloads keyed by AHU id; statuses computed in one batch."""
+    ahus = list(ahus)
+    if not ahus:
+        return {}
+
+    # Only ACTIVE filters should be returned/used for status
+    active_filters = (
+        db.session.query(Filter)
+        .filter(Filter.ahu_id.in_([a.id for a in ahus]), Filter.is_active.is_(True))
+        .order_by(Filter.ahu_id.asc(), Filter.excel_order.asc(), Filter.id.asc())
+        .all()
+    )
+
+    filters_by_ahu = {a.id: [] for a in ahus}
+    for f, st in zip(active_filters, compute_filter_statuses(active_filters)):
+        filters_by_ahu[f.ahu_id].append({
+            "id": f.id,
+            "phase": f.phase,
+            "part_number": f.part_number,
+            "size": f.size,
+            "quantity": f.quantity,
+            "frequency_days": f.frequency_days,
+            "last_service_date": (
+                f.last_service_date.isoformat()
+                if getattr(f, "last_service_date", None) else None
+            ),
+            **{k: v for k, v in st.items() if v is not None}
+        })
+
+    ahu_statuses = compute_ahu_statuses(active_filters)
 
-    # Completed (not overdue, not due soon)
     return {
-        "status": "Completed",
-        "next_due_date": min(next_dues),
-        "days_until_due": min(days_until_list) if days_until_list else None,
-        "days_overdue": 0,
+        a.id: {
+            "ahu_id": a.id,
+            "hospital_id": a.hospital_id,
+            "hospital_name": a.hospital.name if a.hospital else None,
+            "name": a.name,
+            "location": a.location,
+            "notes": a.notes,
+            **(ahu_statuses.get(a.id) or empty_ahu_status()),
+            "filters": filters_by_ahu[a.id],
+        }
+        for a in ahus
     }
 
 
@@ -129,57 +232,75 @@ def compute_ahu_status_from_filters(filters):
 def get_ahu_by_qr(ahu_id):
     try:
         # Support both numeric IDs (new) and legacy labels like "AHU-001".
-        ahu_obj = None
-        try:
-            aid = int(ahu_id)
-            ahu_obj = db.session.get(AHU, aid)
-        except Exception:
-            # not numeric — try to find by canonical name
-            ahu_obj = AHU.query.filter_by(name=ahu_id).first()
+        aid = resolve_ahu_id(ahu_id)
+        if aid is not None:
+            cached = get_qr_payload(aid)
+            if cached is not None:
+                return jsonify(cached), 200
+        ahu_obj = db.session.get(AHU, aid) if aid is not None else None
 
         if not ahu_obj:
             # Return 200 with a not_found flag to avoid noisy 404s in clients
             return jsonify({"not_found": True}), 200
 
-        # Only ACTIVE filters should be returned/used for status
-        active_filters = (
-            db.session.query(Filter)
-            .filter(Filter.ahu_id == ahu_obj.id, Filter.is_active.is_(True))
-            .order_by(Filter.excel_order.asc(), Filter.id.asc())
-            .all()
-        )
+        payload = _qr_scan_payloads([ahu_obj])[ahu_obj.id]
+        set_qr_payload(ahu_obj.id, payload)
+        return jsonify(payload), 200
 
-        filters_payload = []
-        for f in active_filters:
-            st = safe_filter_status(f)
-            filters_payload.append({
-                "id": f.id,
-                "phase": f.phase,
-                "part_number": f.part_number,
-                "size": f.size,
-                "quantity": f.quantity,
-                "frequency_days": f.frequency_days,
-                "last_service_date": (
-                    f.last_service_date.isoformat()
-                    if getattr(f, "last_service_date", None) else None
-                ),
-                **{k: v for k, v in st.items() if v is not None}
-            })
+    except Exception as e:
+        traceback.print_exc()
+        return internal_error(e)
 
-        ahu_status = compute_ahu_status_from_filters(active_filters)
-
-        payload = {
-            "ahu_id": ahu_obj.id,
-            "hospital_id": ahu_obj.hospital_id,
-            "hospital_name": ahu_obj.hospital.name if ahu_obj.hospital else None,
-            "name": ahu_obj.name,
-            "location": ahu_obj.location,
-            "notes": ahu_obj.notes,
-            **ahu_status,
-            "filters": filters_payload,
-        }
 
-        return jsonify(payload), 200
+# ---------------------------------------------------
+# Resolve several scanned QR codes in one round trip
+# ---------------------------------------------------
+MAX_QR_RESOLVE = 50
+
+
+@ahu_bp.route("/qr/resolve", methods=["POST"])
+@require_auth
+def resolve_qr_batch():
+    """
+    Body: {"ids": [12, "AHU-001", ...]} (numeric ids and/or legacy labels).
+    Returns {"results": [...]} in request order; each entry is the
+    GET /qr/<id> payload plus "query", or {"query", "not_found": true}.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        ids = data.get("ids") if isinstance(data, dict) else data
+        if not isinstance(ids, list) or not ids:
+            return jsonify({"error": "ids must be a non-empty list"}), 400
+        if len(ids) > MAX_QR_RESOLVE:
+            return jsonify({"error": f"At most {MAX_QR_RESOLVE} ids per request"}), 400
+
+        resolved = [resolve_ahu_id(raw) for raw in ids]
+        payloads = {}
+        for aid in set(resolved) - {None}:
+            cached = get_qr_payload(aid)
+            if cached is not None:
+                payloads[aid] = cached
+
+        missing = set(resolved) - {None} - set(payloads)
+        if missing:
+            ahus = (
+                db.session.query(AHU)
+                .options(joinedload(AHU.hospital))
+                .filter(AHU.id.in_(missing))
+                .all()
+            )
+            for aid, payload in _qr_scan_payloads(ahus).items():
+                set_qr_payload(aid, payload)
+                payloads[aid] = payload
+
+        results = []
+        for raw, aid in zip(ids, resolved):
+            if aid in payloads:
+                results.append({"query": raw, **payloads[aid]})
+            else:
+                results.append({"query": raw, "not_found": True})
+
+        return jsonify({"results": results}), 200
 
     except Exception as e:
         traceback.print_exc()
@@ -194,12 +315,8 @@ def get_ahu_by_qr(ahu_id):
 def get_filters_for_admin(ahu_id):
     try:
         # Accept either numeric id or legacy label
-        ahu = None
-        try:
-            aid = int(ahu_id)
-            ahu = db.session.get(AHU, aid)
-        except Exception:
-            ahu = AHU.query.filter_by(name=ahu_id).first()
+        aid = resolve_ahu_id(ahu_id)
+        ahu = db.session.get(AHU, aid) if aid is not None else None
 
         if not ahu:
             return jsonify({"error": "AHU not found"}), 404
@@ -230,9 +347,7 @@ def get_filters_for_admin(ahu_id):
                 .filter(
                     JobFilter.filter_id.in_(filter_ids),
                     JobFilter.is_completed.is_(True),
-                    Job.completed_at.isnot(None),
-                    func.date(Job.completed_at) >= window_start,
-                    func.date(Job.completed_at) <= window_end,
+                    within_days(Job.completed_at, window_start, window_end),
                 )
                 .group_by(JobFilter.filter_id)
                 .all()
@@ -283,13 +398,9 @@ def add_filter(ahu_id):
         data = request.json or {}
 
         # Resolve AHU id (support numeric and legacy label)
-        try:
-            aid = int(ahu_id)
-        except Exception:
-            ahu_obj = AHU.query.filter_by(name=ahu_id).first()
-            if not ahu_obj:
-                return jsonify({"error": "AHU not found"}), 404
-            aid = ahu_obj.id
+        aid = resolve_ahu_id(ahu_id)
+        if aid is None:
+            return jsonify({"error": "AHU not found"}), 404
 
         # defensive defaults (prevents KeyError 500)
         f = Filter(
@@ -308,9 +419,14 @@ def add_filter(ahu_id):
                 f.last_service_date = isoparse(str(data.get("last_service_date"))).date()
             except Exception:
                 pass
+        f.sync_next_due_date()
 
         db.session.add(f)
+        db.session.flush()
+        refresh_ahu_rollups([aid])
+        emit_admin_event("filter.updated", filter_id=f.id, ahu_id=aid, action="created")
         db.session.commit()
+        invalidate_qr_payload(aid)
 
         return jsonify({"message": "Filter added", "id": f.id}), 201
 
@@ -331,7 +447,10 @@ def deactivate_filter(filter_id):
             return jsonify({"error": "Filter not found"}), 404
 
         f.is_active = False
+        refresh_ahu_rollups([f.ahu_id])
+        emit_admin_event("filter.updated", filter_id=f.id, ahu_id=f.ahu_id, action="deactivated")
         db.session.commit()
+        invalidate_qr_payload(f.ahu_id)
 
         return jsonify({"message": "Filter deactivated", "id": f.id}), 200
 
@@ -370,8 +489,14 @@ def update_filter(filter_id):
             except Exception:
                 # ignore bad parse
                 pass
+        f.sync_next_due_date()
+        refresh_ahu_rollups([f.ahu_id])
+        emit_admin_event("filter.updated", filter_id=f.id, ahu_id=f.ahu_id, action="updated")
+        hospital_id = f.ahu.hospital_id
 
         db.session.commit()
+        invalidate_qr_payload(f.ahu_id)
+        invalidate_packing_slips(hospital_id)
         return jsonify({"message": "Filter updated"}), 200
 
     except Exception as e:
@@ -379,6 +504,71 @@ def update_filter(filter_id):
         return jsonify({"error": str(e)}), 500
 
 
+# ---------------------------------------------------
+# Admin: Overdue / due-soon filters across the fleet
+# ---------------------------------------------------
+@ahu_bp.route("/admin/filters/due", methods=["GET"])
+@require_admin
+def admin_due_filters():
+    """
+    Active filters that are overdue (default) or due soon, ordered by
+    next_due_date. Query: status=overdue|due_soon, hospital_id, limit.
+    Served from the stored next_due_date index, no Python date math.
+    """
+    try:
+        status = request.args.get("status", "overdue")
+        if status not in ("overdue", "due_soon"):
+            return jsonify({"error": "status must be 'overdue' or 'due_soon'"}), 400
+
+        try:
+            limit = parse_limit(request.args.get("limit"), default=500, maximum=5000)
+        except ValueError:
+            return jsonify({"error": "limit must be a positive integer"}), 400
+
+        clause = overdue_clause if status == "overdue" else due_soon_clause
+        q = (
+            db.session.query(
+                Filter.id, Filter.ahu_id, Filter.phase, Filter.part_number,
+                Filter.size, Filter.quantity, Filter.last_service_date,
+                Filter.next_due_date, AHU.name, AHU.hospital_id,
+            )
+            .join(AHU, AHU.id == Filter.ahu_id)
+            .filter(Filter.is_active.is_(True), clause(Filter.next_due_date))
+        )
+        hospital_id = request.args.get("hospital_id")
+        if hospital_id:
+            try:
+                q = q.filter(AHU.hospital_id == int(hospital_id))
+            except ValueError:
+                return jsonify({"error": "hospital_id must be numeric"}), 400
+
+        rows = q.order_by(Filter.next_due_date.asc(), Filter.id.asc()).limit(limit).all()
+
+        today = date.today()
+        return jsonify([
+            {
+                "id": fid,
+                "ahu_id": ahu_id,
+                "ahu_name": ahu_name,
+                "hospital_id": hospital_id,
+                "phase": phase,
+                "part_number": part_number,
+                "size": size,
+                "quantity": quantity,
+                "last_service_date": last.isoformat() if last else None,
+                "next_due_date": next_due.isoformat(),
+                "days_until_due": max(0, (next_due - today).days),
+                "days_overdue": max(0, (today - next_due).days),
+            }
+            for (fid, ahu_id, phase, part_number, size, quantity, last,
+                 next_due, ahu_name, hospital_id) in rows
+        ]), 200
+
+    except Exception as e:
+        traceback.print_exc()
+        return internal_error(e)
+
+
 # ---------------------------------------------------
 # Admin: Hard delete (keep if you still want it)
 # ---------------------------------------------------
@@ -390,8 +580,13 @@ def delete_filter(filter_id):
         if not f:
             return jsonify({"error": "Filter not found"}), 404
 
+        ahu_id, hospital_id = f.ahu_id, f.ahu.hospital_id
         db.session.delete(f)
+        refresh_ahu_rollups([ahu_id])
+        emit_admin_event("filter.updated", filter_id=filter_id, ahu_id=ahu_id, action="deleted")
         db.session.commit()
+        invalidate_qr_payload(ahu_id)
+        invalidate_packing_slips(hospital_id)
         return jsonify({"message": "Filter removed"}), 200
 
     except Exception as e:
@@ -408,61 +603,10 @@ def get_all_ahus():
     """
     Get all AHUs with their status information.
     This endpoint is accessible by all users (both tech and admin) for read-only access.
+    Supports limit/cursor pagination and hospital_id/building_id/status filters.
     """
     try:
-        ahus = (
-            db.session.query(AHU)
-                .options(joinedload(AHU.hospital), joinedload(AHU.building), selectinload(AHU.filters))
-            .order_by(AHU.hospital_id.asc(), AHU.excel_order.asc(), AHU.id.asc())
-            .all()
-        )
-
-        payload = []
-        for a in ahus:
-            active_filters = [f for f in a.filters if getattr(f, "is_active", True)]
-
-            status_data = compute_ahu_status_from_filters(active_filters)
-
-            overdue_count = 0
-            due_soon_count = 0
-            last_serviced_dates = []
-
-            for f in active_filters:
-                st = safe_filter_status(f)
-                if st.get("status") == "Overdue":
-                    overdue_count += 1
-                elif st.get("status") == "Due Soon":
-                    due_soon_count += 1
-
-                if getattr(f, "last_service_date", None):
-                    last_serviced_dates.append(f.last_service_date)
-
-            payload.append({
-                "id": a.id,
-                "hospital_id": a.hospital_id,
-                "hospital": a.hospital.name if a.hospital else None,
-                "name": a.name,
-                "location": a.location,
-                "notes": a.notes,
-
-                "overdue_count": overdue_count,
-                "due_soon_count": due_soon_count,
-                "last_serviced": (
-                    max(last_serviced_dates).isoformat()
-                    if last_serviced_dates else None
-                ),
-
-                "status": status_data["status"],
-                "next_due_date": status_data["next_due_date"],
-                "days_until_due": status_data["days_until_due"],
-                "days_overdue": status_data["days_overdue"],
-
-                "filters_count": len(active_filters),
-                "building_id": a.building_id,
-                "building": (a.building.name if a.building and getattr(a.building, 'name', None) else None),
-            })
-
-        return jsonify(payload), 200
+        return _ahu_list_response()
 
     except Exception as e:
         traceback.print_exc()
@@ -476,59 +620,7 @@ def get_all_ahus():
 @require_admin
 def admin_get_all_ahus():
     try:
-        ahus = (
-            db.session.query(AHU)
-                .options(joinedload(AHU.hospital), joinedload(AHU.building), selectinload(AHU.filters))
-            .order_by(AHU.hospital_id.asc(), AHU.excel_order.asc(), AHU.id.asc())
-            .all()
-        )
-
-        payload = []
-        for a in ahus:
-            active_filters = [f for f in a.filters if getattr(f, "is_active", True)]
-
-            status_data = compute_ahu_status_from_filters(active_filters)
-
-            overdue_count = 0
-            due_soon_count = 0
-            last_serviced_dates = []
-
-            for f in active_filters:
-                st = safe_filter_status(f)
-                if st.get("status") == "Overdue":
-                    overdue_count += 1
-                elif st.get("status") == "Due Soon":
-                    due_soon_count += 1
-
-                if getattr(f, "last_service_date", None):
-                    last_serviced_dates.append(f.last_service_date)
-
-            payload.append({
-                "id": a.id,
-                "hospital_id": a.hospital_id,
-                "hospital": a.hospital.name if a.hospital else None,
-                "name": a.name,
-                "location": a.location,
-                "notes": a.notes,
-
-                "overdue_count": overdue_count,
-                "due_soon_count": due_soon_count,
-                "last_serviced": (
-                    max(last_serviced_dates).isoformat()
-                    if last_serviced_dates else None
-                ),
-
-                "status": status_data["status"],
-                "next_due_date": status_data["next_due_date"],
-                "days_until_due": status_data["days_until_due"],
-                "days_overdue": status_data["days_overdue"],
-
-                "filters_count": len(active_filters),
-                "building_id": a.building_id,
-                "building": (a.building.name if a.building and getattr(a.building, 'name', None) else None),
-            })
-
-        return jsonify(payload), 200
+        return _ahu_list_response()
 
     except Exception as e:
         traceback.print_exc()
@@ -543,7 +635,10 @@ def reactivate_filter(filter_id):
         return jsonify({"error": "Filter not found"}), 404
 
     f.is_active = True
+    refresh_ahu_rollups([f.ahu_id])
+    emit_admin_event("filter.updated", filter_id=f.id, ahu_id=f.ahu_id, action="reactivated")
     db.session.commit()
+    invalidate_qr_payload(f.ahu_id)
 
     return jsonify({"message": "Filter reactivated", "id": f.id}), 200
 
@@ -591,6 +686,8 @@ def admin_create_ahu():
             excel_order=excel_order,
         )
         db.session.add(a)
+        db.session.flush()
+        refresh_ahu_rollups([a.id])
         db.session.commit()
 
         return jsonify({
@@ -690,6 +787,7 @@ def admin_update_ahu(ahu_id):
 
         a.notes = new_notes
         db.session.commit()
+        invalidate_qr_payload(a.id)
 
         return jsonify({"id": a.id, "notes": a.notes}), 200
 
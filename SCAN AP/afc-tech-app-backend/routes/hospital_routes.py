@@ -3,8 +3,8 @@ from models import Hospital, AHU, Building, Filter
 from sqlalchemy.orm import selectinload
 from sqlalchemy import func
 from db import db
-from datetime import date, timedelta
 from middleware.auth import require_auth
+from utility.status import compute_ahu_statuses, compute_filter_statuses, empty_ahu_status
 
 hospital_bp = Blueprint("hospital", __name__)
 
@@ -68,59 +68,36 @@ def get_all_hospitals():
 @hospital_bp.route("/hospital/<int:hospital_id>/ahus", methods=["GET"])
 @require_auth
 def get_ahus_for_hospital(hospital_id):
-    ahus = AHU.query.filter_by(hospital_id=hospital_id).all()
+    ahus = (
+        AHU.query.filter_by(hospital_id=hospital_id)
+        .options(selectinload(AHU.filters))
+        .all()
+    )
+    statuses = compute_ahu_statuses(f for a in ahus for f in (a.filters or []))
 
     result = []
     for a in ahus:
-        overdue_count = 0
-        due_soon_count = 0
-        filters_count = 0
-        latest_service = None
-        next_due_dates = []
-
-        for f in (a.filters or []):
-            filters_count += 1
-            last = getattr(f, "last_service_date", None)
-            freq = getattr(f, "frequency_days", None)
-
-            if last:
-                last_dt = last if isinstance(last, date) else last
-                if latest_service is None or (last_dt and last_dt > latest_service):
-                    latest_service = last_dt
-
-            if last and freq:
-                try:
-                    next_due = last + timedelta(days=int(freq))
-                    next_due_dates.append(next_due)
-                    delta = (next_due - date.today()).days
-                    if delta < 0:
-                        overdue_count += 1
-                    elif delta <= 7:
-                        due_soon_count += 1
-                except Exception:
-                    pass
-
-        if overdue_count > 0:
+        st = statuses.get(a.id) or empty_ahu_status()
+
+        if st["overdue_count"] > 0:
             status = "Overdue"
-        elif due_soon_count > 0:
+        elif st["due_soon_count"] > 0:
             status = "Due Soon"
-        elif filters_count > 0:
+        elif st["filters_count"] > 0:
             status = "Completed"
         else:
             status = "Pending"
 
-        next_due_date = min(next_due_dates).isoformat() if next_due_dates else None
-
         result.append({
             "id": a.id,
             "building_id": getattr(a, "building_id", None),
             "name": a.name,
             "location": a.location,
-            "filters_count": filters_count,
-            "overdue_count": overdue_count,
-            "due_soon_count": due_soon_count,
-            "last_serviced": latest_service.isoformat() if latest_service else None,
-            "next_due_date": next_due_date,
+            "filters_count": st["filters_count"],
+            "overdue_count": st["overdue_count"],
+            "due_soon_count": st["due_soon_count"],
+            "last_serviced": st["last_serviced"],
+            "next_due_date": st["next_due_date"],
             "status": status,
         })
 
@@ -176,13 +153,23 @@ def hospital_offline_bundle(hospital_id):
         "ahus": [],
     }
 
+    all_filters = [f for a in hospital.ahus for f in (a.filters or [])]
+    filter_statuses = dict(zip(
+        (f.id for f in all_filters), compute_filter_statuses(all_filters)
+    ))
+    ahu_statuses = compute_ahu_statuses(
+        f for f in all_filters if getattr(f, "is_active", True)
+    )
+
     for a in hospital.ahus:
+        st = ahu_statuses.get(a.id) or empty_ahu_status()
         payload["ahus"].append({
             "id": a.id,
             "hospital_id": a.hospital_id,
             "name": a.name,
             "location": a.location,
             "notes": getattr(a, "notes", None),
+            **st,
             "filters": [
                 {
                     "id": f.id,
@@ -199,6 +186,7 @@ def hospital_offline_bundle(hospital_id):
                         else None
                     ),
                     "notes": getattr(f, "notes", None),
+                    **filter_statuses[f.id],
                 }
                 for f in (a.filters or [])
             ],
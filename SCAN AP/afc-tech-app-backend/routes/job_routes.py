@@ -1,157 +1,585 @@
-from flask import Blueprint, request, jsonify, g
-from models import Job, JobFilter, Filter, AHU, Technician
-from models import JobSignature, Notification
+from flask import Blueprint, Response, request, jsonify, g, stream_with_context
+from models import Job, JobFilter, Filter, AHU, Building, Hospital, Technician
+from models import JobSignature, Notification, SupervisorSignoffJob, compute_next_due_date
 from db import db
+import csv
+import io
+import json
+import math
 from datetime import datetime, timezone
 from dateutil.parser import isoparse
-from sqlalchemy.orm import joinedload
+from sqlalchemy import exists, insert, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from middleware.auth import require_admin, require_auth, is_admin
 from utility.http import internal_error, validate_signature_payload
+from utility.ahu_resolver import resolve_ahu_id
+from utility.cache import invalidate_packing_slips, invalidate_qr_payload
+from utility.daterange import day_bounds
+from utility.events import emit_admin_events
+from utility.pagination import decode_cursor, encode_cursor, parse_limit
+from utility.rollup import refresh_ahu_rollups
 
 job_bp = Blueprint("jobs", __name__)
 
+# Upper bound on jobs accepted by one POST /jobs/batch
+MAX_JOB_BATCH = 100
 
-def _job_query_with_relations():
+# Width of jobs.local_id; longer client keys are rejected, not truncated
+LOCAL_ID_MAX_LENGTH = 64
+
+# Re-runs of a batch that lost a local_id race to a concurrent replay
+_BATCH_REPLAY_RETRIES = 2
+
+
+# Job ids per IN query when attaching filters to a listing
+_JOB_FILTER_CHUNK = 1000
+
+# Rows per server-side cursor fetch (and per streamed chunk) in exports
+EXPORT_CHUNK = 1000
+
+EXPORT_CSV_COLUMNS = (
+    "job_id", "completed_at", "hospital_id", "hospital_name", "building_id",
+    "building_name", "ahu_id", "ahu_name", "technician", "overall_notes",
+    "gps_lat", "gps_long", "filter_id", "phase", "part_number", "size",
+    "is_completed", "is_inspected", "note", "initial_resistance",
+    "final_resistance",
+)
+
+
+def _job_list_query():
+    """
+    Job listing rows as plain tuples. Every join is many-to-one, so there is
+    exactly one row per job (no jobs x filters fan-out); filters are attached
+    separately by _job_filters_by_job.
+    """
     return (
-        Job.query
-        .options(
-            joinedload(Job.ahu).joinedload(AHU.hospital),
-            joinedload(Job.ahu).joinedload(AHU.building),
-            joinedload(Job.technician),
-            joinedload(Job.job_filters).joinedload(JobFilter.filter),
+        db.session.query(
+            Job.id, Job.ahu_id, AHU.name, Building.id, Building.name,
+            Hospital.id, Hospital.name, Technician.name, Job.completed_at,
         )
+        .outerjoin(AHU, AHU.id == Job.ahu_id)
+        .outerjoin(Building, Building.id == AHU.building_id)
+        .outerjoin(Hospital, Hospital.id == AHU.hospital_id)
+        .outerjoin(Technician, Technician.id == Job.tech_id)
     )
 
 
-def _serialize_job_summary(j):
-    return {
-        "id": j.id,
-        "ahu_id": j.ahu_id,
-        "ahu_name": j.ahu.name if j.ahu else None,
-        "building_id": j.ahu.building.id if j.ahu and j.ahu.building else None,
-        "building_name": j.ahu.building.name if j.ahu and j.ahu.building else None,
-        "hospital_id": j.ahu.hospital.id if j.ahu and j.ahu.hospital else None,
-        "hospital_name": j.ahu.hospital.name if j.ahu and j.ahu.hospital else None,
-        "technician": j.technician.name if j.technician else None,
-        "completed_at": j.completed_at.isoformat(),
-        "filters": [
-            {
-                "filter_id": jf.filter_id,
-                "phase": jf.filter.phase,
-                "part_number": jf.filter.part_number,
-                "size": jf.filter.size,
-                "is_completed": jf.is_completed,
-                "note": jf.note,
-                "initial_resistance": jf.initial_resistance,
-                "final_resistance": jf.final_resistance,
-            }
-            for jf in j.job_filters
-        ],
-    }
+def _job_filters_by_job(job_ids):
+    """{job_id: [filter dicts]} for the given jobs, one column query per chunk."""
+    by_job = {}
+    job_ids = list(job_ids)
+    for i in range(0, len(job_ids), _JOB_FILTER_CHUNK):
+        rows = (
+            db.session.query(
+                JobFilter.job_id, JobFilter.filter_id, Filter.phase,
+                Filter.part_number, Filter.size, JobFilter.is_completed,
+                JobFilter.is_inspected, JobFilter.note, JobFilter.initial_resistance,
+                JobFilter.final_resistance,
+            )
+            .join(Filter, Filter.id == JobFilter.filter_id)
+            .filter(JobFilter.job_id.in_(job_ids[i:i + _JOB_FILTER_CHUNK]))
+            .order_by(JobFilter.job_id, JobFilter.id)
+        )
+        for (job_id, filter_id, phase, part_number, size, is_completed,
+             is_inspected, note, initial_resistance, final_resistance) in rows:
+            by_job.setdefault(job_id, []).append({
+                "filter_id": filter_id,
+                "phase": phase,
+                "part_number": part_number,
+                "size": size,
+                "is_completed": is_completed,
+                "is_inspected": is_inspected,
+                "note": note,
+                "initial_resistance": initial_resistance,
+                "final_resistance": final_resistance,
+            })
+    return by_job
+
+
+def _job_list_payload(rows, include_filters=True):
+    filters_by_job = _job_filters_by_job(r[0] for r in rows) if include_filters else None
+    payload = []
+    for (job_id, ahu_id, ahu_name, building_id, building_name, hospital_id,
+         hospital_name, technician, completed_at) in rows:
+        summary = {
+            "id": job_id,
+            "ahu_id": ahu_id,
+            "ahu_name": ahu_name,
+            "building_id": building_id,
+            "building_name": building_name,
+            "hospital_id": hospital_id,
+            "hospital_name": hospital_name,
+            "technician": technician,
+            "completed_at": completed_at.isoformat(),
+        }
+        if include_filters:
+            summary["filters"] = filters_by_job.get(job_id, [])
+        payload.append(summary)
+    return payload
 
 
-@job_bp.route("/jobs", methods=["POST"])
-@require_auth
-def create_job():
+def _parse_day(args, key):
+    raw = args.get(key)
+    if not raw:
+        return None
     try:
-        data = request.json or {}
+        return datetime.strptime(raw, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid {key} date, expected YYYY-MM-DD")
 
-        ahu_id_raw = data.get("ahu_id")
-        if ahu_id_raw is None:
-            return jsonify({"error": "Missing AHU ID"}), 400
 
+def _parse_id(args, key):
+    raw = args.get(key)
+    if raw in (None, ""):
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"Invalid {key}")
+
+
+def _filter_job_list(q, args, tech_id=None):
+    """
+    Push listing filters into SQL: from / to (inclusive YYYY-MM-DD, UTC),
+    hospital_id, tech_id and ahu_id. `tech_id` pins non-admins to themselves.
+    """
+    start, end = _parse_day(args, "from"), _parse_day(args, "to")
+    if start:
+        q = q.filter(Job.completed_at >= day_bounds(start, start)[0])
+    if end:
+        q = q.filter(Job.completed_at < day_bounds(end, end)[1])
+
+    hospital_id = _parse_id(args, "hospital_id")
+    if hospital_id is not None:
+        q = q.filter(Job.ahu_id.in_(
+            db.session.query(AHU.id).filter(AHU.hospital_id == hospital_id)
+        ))
+
+    if tech_id is None:
+        tech_id = _parse_id(args, "tech_id")
+    if tech_id is not None:
+        q = q.filter(Job.tech_id == tech_id)
+
+    # Legacy clients send odd ahu_id values; those were always ignored
+    try:
+        q = q.filter(Job.ahu_id == int(args["ahu_id"]))
+    except (KeyError, TypeError, ValueError):
+        pass
+    return q
+
+
+def _job_list_response(tech_id=None, unsigned=False):
+    """
+    Shared body of GET /jobs, GET /admin/jobs and GET /admin/jobs/unsigned,
+    newest first. `unsigned` keeps only jobs no supervisor signoff covers.
+
+    Without `limit` or `cursor` the whole (filtered) list is returned as a
+    bare array including each job's filters. With either, one page keyed on
+    (completed_at, id) is returned as {"data", "next_cursor"}; pages are
+    compact unless `include_filters=1`.
+    """
+    args = request.args
+    paged = "limit" in args or "cursor" in args
+    include_filters = args.get("include_filters", "0" if paged else "1") == "1"
+    try:
+        q = _filter_job_list(_job_list_query(), args, tech_id)
+        if unsigned:
+            q = q.filter(~exists().where(SupervisorSignoffJob.job_id == Job.id))
+        q = q.order_by(Job.completed_at.desc(), Job.id.desc())
+        if not paged:
+            return jsonify(_job_list_payload(q.all(), include_filters)), 200
+
+        limit = parse_limit(args.get("limit"))
+        if args.get("cursor"):
+            completed_at, job_id = decode_cursor(args["cursor"], 2)
+            try:
+                after = (datetime.fromisoformat(completed_at), int(job_id))
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            q = q.filter(tuple_(Job.completed_at, Job.id) < tuple_(*after))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    rows = q.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.completed_at, last[0]])
+
+    return jsonify({
+        "data": _job_list_payload(rows, include_filters),
+        "next_cursor": next_cursor,
+    }), 200
+
+
+def _parse_completed_at(raw):
+    """Client ISO timestamp -> naive UTC datetime; now() when missing or invalid."""
+    if raw:
         try:
-            ahu_id = int(ahu_id_raw)
+            dt = isoparse(raw)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.astimezone(timezone.utc).replace(tzinfo=None)
         except Exception:
-            ahu_obj = AHU.query.filter_by(name=str(ahu_id_raw)).first()
-            if not ahu_obj:
-                return jsonify({"error": "Invalid AHU ID"}), 400
-            ahu_id = ahu_obj.id
+            pass
+    return datetime.utcnow()
 
-        tech_id = g.current_tech_id
-        overall_notes = data.get("overall_notes")
-        gps_lat = data.get("gps_lat")
-        gps_long = data.get("gps_long")
-        filter_results = data.get("filters", [])
 
-        ahu = db.session.get(AHU, ahu_id)
-        if not ahu:
-            return jsonify({"error": "Invalid AHU ID"}), 400
+def _note_text(value):
+    return str(value).strip() if value and str(value).strip() else None
+
+
+_TRUE_STRINGS = {"true", "1", "yes", "y", "on"}
+_FALSE_STRINGS = {"false", "0", "no", "n", "off", ""}
+
+
+def _as_bool(value, field):
+    """JSON flag -> bool; accepts booleans, 0/1 and the usual strings."""
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _TRUE_STRINGS | _FALSE_STRINGS:
+        return value.strip().lower() in _TRUE_STRINGS
+    raise ValueError(f"{field} must be true or false")
+
+
+def _as_float(value, field):
+    """Optional number (or numeric string) -> float / None."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{field} must be a number")
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"{field} must be a number")
+    if not math.isfinite(number):
+        raise ValueError(f"{field} must be a number")
+    return number
+
+
+def _as_text(value, field, default=None):
+    """Optional free text; numbers are stringified, objects/lists rejected."""
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"{field} must be text")
+    return str(value)
+
+
+def _clean_job_fields(data):
+    """Type-checked job columns from a payload; raises ValueError with the field name."""
+    return {
+        "overall_notes": _as_text(data.get("overall_notes"), "overall_notes"),
+        "gps_lat": _as_float(data.get("gps_lat"), "gps_lat"),
+        "gps_long": _as_float(data.get("gps_long"), "gps_long"),
+    }
+
 
-        incoming_completed = data.get("completed_at")
-        if incoming_completed:
+def _clean_filter_fields(f):
+    """Type-checked job_filter columns from one filters[] entry; raises ValueError."""
+    return {
+        "is_completed": _as_bool(f.get("is_completed"), "is_completed"),
+        "is_inspected": _as_bool(f.get("is_inspected"), "is_inspected"),
+        "note": _as_text(f.get("note"), "note", default=""),
+        "initial_resistance": _as_float(f.get("initial_resistance"), "initial_resistance"),
+        "final_resistance": _as_float(f.get("final_resistance"), "final_resistance"),
+    }
+
+
+def _local_id(data):
+    """Client idempotency key (offline queue local_id), or None."""
+    raw = data.get("local_id") or data.get("idempotency_key")
+    raw = str(raw).strip() if raw is not None else ""
+    return raw or None
+
+
+def _find_replayed_jobs(tech_id, local_ids):
+    """{local_id: (job_id, ahu_id)} for keys this technician already submitted."""
+    if not local_ids:
+        return {}
+    rows = (
+        db.session.query(Job.local_id, Job.id, Job.ahu_id)
+        .filter(Job.tech_id == tech_id, Job.local_id.in_(set(local_ids)))
+        .all()
+    )
+    return {lid: (job_id, ahu_id) for lid, job_id, ahu_id in rows}
+
+
+def _replayed_job_response(job_id):
+    return jsonify({"message": "Job already recorded", "job_id": job_id, "duplicate": True}), 200
+
+
+def _fill_repeats(results):
+    """Point in-batch local_id repeats (stored as the first index) at that outcome."""
+    for i, r in enumerate(results):
+        if isinstance(r, int):
+            first = results[r]
+            results[i] = {**first, "duplicate": True} if "job_id" in first else first
+    return results
+
+
+def _invalidate_packing_slips(landed):
+    """Drop cached packing slips whose window now has new jobs (after commit)."""
+    for hospital_id, day in landed:
+        invalidate_packing_slips(hospital_id, day)
+
+
+def _record_jobs(payloads, tech_id, landed=None):
+    """
+    Validate and insert a list of create_job payloads in the current
+    transaction (the caller commits).
+
+    AHUs and filters are validated with one IN query each (a filter must
+    belong to the job's AHU); jobs, job_filters and notifications are written
+    with bulk inserts and serviced filters get their last_service_date /
+    next_due_date in one executemany UPDATE. Field types are checked per
+    payload first, so a malformed item gets its own error instead of failing
+    the bulk statements for everyone. Returns one result per
+    payload, in order: {"job_id", "ahu_id"} or {"error": message}. Invalid payloads
+    are skipped without affecting the rest. Payloads whose local_id was
+    already recorded (or repeats within the batch) resolve to the original
+    job with "duplicate": True. When given, `landed` collects the
+    (hospital_id, completed day) of every job written.
+    """
+    results = [None] * len(payloads)
+    ahu_ids, filter_ids = {}, set()
+    replayed = _find_replayed_jobs(
+        tech_id, [_local_id(p) for p in payloads if isinstance(p, dict) and _local_id(p)]
+    )
+    first_of = {}
+
+    for i, data in enumerate(payloads):
+        if not isinstance(data, dict):
+            results[i] = {"error": "Invalid job payload"}
+            continue
+        local_id = _local_id(data)
+        if local_id and len(local_id) > LOCAL_ID_MAX_LENGTH:
+            # Truncating would make distinct keys collide on ux_jobs_tech_local_id
+            results[i] = {"error": f"local_id must be at most {LOCAL_ID_MAX_LENGTH} characters"}
+            continue
+        if local_id in replayed:
+            job_id, ahu_id = replayed[local_id]
+            results[i] = {"job_id": job_id, "ahu_id": ahu_id, "duplicate": True}
+            continue
+        if local_id in first_of:
+            results[i] = first_of[local_id]
+            continue
+        if local_id:
+            first_of[local_id] = i
+        if data.get("ahu_id") is None:
+            results[i] = {"error": "Missing AHU ID"}
+            continue
+        ahu_id = resolve_ahu_id(data.get("ahu_id"))
+        if ahu_id is None:
+            results[i] = {"error": "Invalid AHU ID"}
+            continue
+        filter_list = data.get("filters") or []
+        if not isinstance(filter_list, list):
+            results[i] = {"error": "filters must be a list"}
+            continue
+        ahu_ids[i] = ahu_id
+        for f in filter_list:
+            try:
+                filter_ids.add(int(f.get("filter_id")))
+            except (AttributeError, TypeError, ValueError):
+                pass
+
+    hospital_of = dict(
+        db.session.query(AHU.id, AHU.hospital_id).filter(AHU.id.in_(set(ahu_ids.values())))
+    ) if ahu_ids else {}
+    filters = {
+        row.id: row for row in db.session.query(
+            Filter.id, Filter.ahu_id, Filter.frequency_days
+        ).filter(Filter.id.in_(filter_ids))
+    } if filter_ids else {}
+
+    valid = []
+    for i, ahu_id in ahu_ids.items():
+        if ahu_id not in hospital_of:
+            results[i] = {"error": "Invalid AHU ID"}
+            continue
+        try:
+            fields = _clean_job_fields(payloads[i])
+        except ValueError as e:
+            results[i] = {"error": str(e)}
+            continue
+        rows = []
+        for f in payloads[i].get("filters") or []:
+            raw_id = f.get("filter_id") if isinstance(f, dict) else None
+            try:
+                filter_obj = filters.get(int(raw_id))
+            except (TypeError, ValueError):
+                filter_obj = None
+            if filter_obj is None:
+                results[i] = {"error": f"Invalid filter ID: {raw_id}"}
+                break
+            if filter_obj.ahu_id != ahu_id:
+                results[i] = {"error": f"Filter {raw_id} does not belong to AHU {ahu_id}"}
+                break
             try:
-                dt = isoparse(incoming_completed)
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                completed_at_val = dt.astimezone(timezone.utc).replace(tzinfo=None)
-            except Exception:
-                completed_at_val = datetime.utcnow()
+                rows.append((filter_obj, _clean_filter_fields(f)))
+            except ValueError as e:
+                results[i] = {"error": f"Filter {raw_id}: {e}"}
+                break
         else:
-            completed_at_val = datetime.utcnow()
+            valid.append((i, ahu_id, rows, fields))
 
-        job = Job(
+    if not valid:
+        return _fill_repeats(results)
+
+    jobs = []
+    for i, ahu_id, _, fields in valid:
+        data = payloads[i]
+        jobs.append(Job(
             ahu_id=ahu_id,
             tech_id=tech_id,
-            overall_notes=overall_notes,
-            gps_lat=gps_lat,
-            gps_long=gps_long,
-            completed_at=completed_at_val,
+            **fields,
+            completed_at=_parse_completed_at(data.get("completed_at")),
+            local_id=_local_id(data),
+        ))
+    db.session.add_all(jobs)
+    db.session.flush()
+
+    job_filter_rows, notification_rows, last_job, serviced, events = [], [], {}, {}, []
+    for (i, ahu_id, rows, _), job in zip(valid, jobs):
+        notes = []
+        for filter_obj, f in rows:
+            job_filter_rows.append({"job_id": job.id, "filter_id": filter_obj.id, **f})
+            if f["is_completed"] or f["is_inspected"]:
+                # Later payloads win, as with sequential POST /jobs calls
+                served_on = job.completed_at.date()
+                serviced[filter_obj.id] = {
+                    "id": filter_obj.id,
+                    "last_service_date": served_on,
+                    "next_due_date": compute_next_due_date(served_on, filter_obj.frequency_days),
+                }
+            notes.append(_note_text(f["note"]))
+        notes.append(_note_text(job.overall_notes))
+
+        notes = [text for text in notes if text]
+        notification_rows.extend(
+            {
+                "hospital_id": hospital_of[ahu_id],
+                "ahu_id": ahu_id,
+                "job_id": job.id,
+                "technician_id": tech_id,
+                "comment_text": text,
+                "status": "pending",
+            }
+            for text in notes
         )
-        db.session.add(job)
-        db.session.flush()
-
-        for f in filter_results:
-            filter_id = f.get("filter_id")
-            filter_obj = db.session.get(Filter, filter_id)
-            if not filter_obj:
-                return jsonify({"error": f"Invalid filter ID: {filter_id}"}), 400
-
-            jf = JobFilter(
-                job_id=job.id,
-                filter_id=filter_id,
-                is_completed=f.get("is_completed", False),
-                is_inspected=f.get("is_inspected", False),
-                note=f.get("note", ""),
-                initial_resistance=f.get("initial_resistance"),
-                final_resistance=f.get("final_resistance"),
-            )
-            db.session.add(jf)
-
-            if jf.is_completed or jf.is_inspected:
-                filter_obj.last_service_date = completed_at_val.date()
-
-            if jf.note and str(jf.note).strip():
-                db.session.add(
-                    Notification(
-                        hospital_id=ahu.hospital_id,
-                        ahu_id=ahu.id,
-                        job_id=job.id,
-                        technician_id=tech_id,
-                        comment_text=str(jf.note).strip(),
-                        status="pending",
-                    )
-                )
-
-        if job.overall_notes and str(job.overall_notes).strip():
-            db.session.add(
-                Notification(
-                    hospital_id=ahu.hospital_id,
-                    ahu_id=ahu.id,
-                    job_id=job.id,
-                    technician_id=tech_id,
-                    comment_text=str(job.overall_notes).strip(),
-                    status="pending",
-                )
-            )
+        event = {"job_id": job.id, "ahu_id": ahu_id, "hospital_id": hospital_of[ahu_id]}
+        events.append(("job.created", {
+            **event, "tech_id": tech_id, "completed_at": job.completed_at.isoformat(),
+        }))
+        if notes:
+            events.append(("notification.created", {**event, "count": len(notes)}))
+        last_job[ahu_id] = job.id
+        if landed is not None:
+            landed.add((hospital_of[ahu_id], job.completed_at.date()))
+        results[i] = {"job_id": job.id, "ahu_id": ahu_id}
+
+    if job_filter_rows:
+        db.session.execute(insert(JobFilter), job_filter_rows)
+    if notification_rows:
+        db.session.execute(insert(Notification), notification_rows)
+    if serviced:
+        db.session.execute(update(Filter), list(serviced.values()))
+    emit_admin_events(events)
+
+    refresh_ahu_rollups(last_job.keys(), last_job_ids=last_job)
+
+    return _fill_repeats(results)
+
+
+@job_bp.route("/jobs", methods=["POST"])
+@require_auth
+def create_job():
+    local_id = tech_id = None
+    try:
+        data = request.json or {}
+        tech_id = g.current_tech_id
+        local_id = _local_id(data)
+
+        landed = set()
+        outcome = _record_jobs([data], tech_id, landed)[0]
+        if "error" in outcome:
+            db.session.rollback()
+            return jsonify({"error": outcome["error"]}), 400
+        if outcome.get("duplicate"):
+            return _replayed_job_response(outcome["job_id"])
 
         db.session.commit()
-        return jsonify({"message": "Job recorded", "job_id": job.id}), 201
+        invalidate_qr_payload(outcome["ahu_id"])
+        _invalidate_packing_slips(landed)
+        return jsonify({"message": "Job recorded", "job_id": outcome["job_id"]}), 201
+    except IntegrityError as e:
+        # Concurrent replay of the same local_id won the unique index
+        db.session.rollback()
+        replay = local_id and _find_replayed_jobs(tech_id, [local_id]).get(local_id)
+        if replay:
+            return _replayed_job_response(replay[0])
+        return internal_error(e)
     except Exception as e:
         db.session.rollback()
         return internal_error(e)
 
 
+@job_bp.route("/jobs/batch", methods=["POST"])
+@require_auth
+def create_jobs_batch():
+    """
+    Record several queued jobs in one request/transaction. Accepts a list of
+    create_job payloads (or {"jobs": [...]}) and returns per-item results so
+    one bad payload doesn't block the rest of an offline queue flush.
+    """
+    data = request.get_json(silent=True)
+    payloads = data.get("jobs") if isinstance(data, dict) else data
+    if not isinstance(payloads, list) or not payloads:
+        return jsonify({"error": "Expected a non-empty list of jobs"}), 400
+    if len(payloads) > MAX_JOB_BATCH:
+        return jsonify({"error": f"At most {MAX_JOB_BATCH} jobs per batch"}), 400
+
+    for attempt in range(_BATCH_REPLAY_RETRIES + 1):
+        landed = set()
+        try:
+            outcomes = _record_jobs(payloads, g.current_tech_id, landed)
+            db.session.commit()
+            break
+        except IntegrityError as e:
+            # A concurrent replay of one of these local_ids won the unique
+            # index. Retry: _record_jobs now finds the committed originals and
+            # reports those items as duplicates, recording the rest.
+            db.session.rollback()
+            if attempt == _BATCH_REPLAY_RETRIES:
+                return internal_error(e)
+        except Exception as e:
+            db.session.rollback()
+            return internal_error(e)
+
+    invalidate_qr_payload(*{o["ahu_id"] for o in outcomes if "ahu_id" in o})
+    _invalidate_packing_slips(landed)
+
+    results = []
+    for i, (payload, outcome) in enumerate(zip(payloads, outcomes)):
+        item = {"index": i, "ok": "job_id" in outcome, **outcome}
+        if isinstance(payload, dict) and payload.get("local_id") is not None:
+            item["local_id"] = payload.get("local_id")
+        results.append(item)
+
+    duplicates = sum(1 for r in results if r.get("duplicate"))
+    failed = sum(1 for r in results if not r["ok"])
+    return jsonify({
+        "created": len(results) - duplicates - failed,
+        "duplicates": duplicates,
+        "failed": failed,
+        "results": results,
+    }), 200
+
+
 @job_bp.route("/jobs/<int:job_id>", methods=["GET"])
 @require_auth
 def get_job(job_id):
@@ -192,27 +620,98 @@ def get_job(job_id):
 @job_bp.route("/jobs", methods=["GET"])
 @require_auth
 def get_all_jobs():
-    q = _job_query_with_relations()
-    if not is_admin():
-        q = q.filter(Job.tech_id == g.current_tech_id)
-
-    jobs = q.order_by(Job.completed_at.desc()).all()
-    return jsonify([_serialize_job_summary(j) for j in jobs]), 200
+    return _job_list_response(tech_id=None if is_admin() else g.current_tech_id)
 
 
 @job_bp.route("/admin/jobs", methods=["GET"])
 @require_admin
 def admin_get_all_jobs():
-    ahu_id = request.args.get("ahu_id")
-    q = _job_query_with_relations()
-    if ahu_id:
-        try:
-            q = q.filter_by(ahu_id=int(ahu_id))
-        except Exception:
-            pass
+    return _job_list_response()
+
 
-    jobs = q.order_by(Job.completed_at.desc()).all()
-    return jsonify([_serialize_job_summary(j) for j in jobs]), 200
+@job_bp.route("/admin/jobs/unsigned", methods=["GET"])
+@require_admin
+def admin_get_unsigned_jobs():
+    """
+    Jobs of a hospital not yet covered by a supervisor signoff. Query:
+    hospital_id (required), from / to (YYYY-MM-DD) and the same
+    limit / cursor / include_filters paging as /admin/jobs.
+    """
+    if not request.args.get("hospital_id"):
+        return jsonify({"error": "hospital_id is required"}), 400
+    return _job_list_response(unsigned=True)
+
+
+def _export_jobs(args, fmt):
+    """
+    Generator of NDJSON (one job per line, filters nested) or CSV (one line
+    per job filter) text chunks, newest jobs last. Rows come from a
+    server-side cursor EXPORT_CHUNK at a time, so memory stays flat.
+    """
+    q = (
+        _filter_job_list(_job_list_query(), args)
+        .add_columns(Job.overall_notes, Job.gps_lat, Job.gps_long)
+        .order_by(Job.completed_at.asc(), Job.id.asc())
+    )
+    result = db.session.execute(q.statement.execution_options(yield_per=EXPORT_CHUNK))
+
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(EXPORT_CSV_COLUMNS)
+        yield buf.getvalue()
+
+    for rows in result.partitions():
+        filters_by_job = _job_filters_by_job(r[0] for r in rows)
+        buf = io.StringIO()
+        writer = csv.writer(buf) if fmt == "csv" else None
+        for row in rows:
+            job = _job_list_payload([row[:9]], include_filters=False)[0]
+            job.update(overall_notes=row[9], gps_lat=row[10], gps_long=row[11])
+            filters = filters_by_job.get(job["id"], [])
+            if writer is None:
+                buf.write(json.dumps({**job, "filters": filters}) + "\n")
+                continue
+            base = [
+                job["id"], job["completed_at"], job["hospital_id"], job["hospital_name"],
+                job["building_id"], job["building_name"], job["ahu_id"], job["ahu_name"],
+                job["technician"], job["overall_notes"], job["gps_lat"], job["gps_long"],
+            ]
+            for f in filters or [{}]:
+                writer.writerow(base + [
+                    f.get("filter_id"), f.get("phase"), f.get("part_number"), f.get("size"),
+                    f.get("is_completed"), f.get("is_inspected"), f.get("note"),
+                    f.get("initial_resistance"), f.get("final_resistance"),
+                ])
+        yield buf.getvalue()
+
+
+@job_bp.route("/admin/jobs/export", methods=["GET"])
+@require_admin
+def admin_export_jobs():
+    """
+    Stream the job history (same from/to/hospital_id/tech_id/ahu_id filters
+    as /admin/jobs) as format=ndjson (default) or format=csv.
+    """
+    fmt = (request.args.get("format") or "ndjson").lower()
+    if fmt not in ("ndjson", "csv"):
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+    try:
+        # Validate filters up front; errors can't be reported mid-stream
+        _filter_job_list(_job_list_query(), request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    stamp = datetime.utcnow().strftime("%Y%m%d")
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(
+        stream_with_context(_export_jobs(request.args, fmt)),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f'attachment; filename="jobs-{stamp}.{fmt}"',
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 @job_bp.route("/technicians/<int:tech_id>/jobs", methods=["GET"])
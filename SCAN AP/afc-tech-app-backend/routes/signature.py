@@ -1,10 +1,17 @@
-from flask import Blueprint, jsonify
-from models import Job
+import base64
+import binascii
+import hashlib
+
+from flask import Blueprint, Response, g, jsonify, request
+from models import Job, JobSignature, SupervisorSignoff
 from db import db
 from sqlalchemy.orm import joinedload
-from middleware.auth import require_admin
+from middleware.auth import is_admin, require_admin, require_auth
 from utility.http import internal_error
 
+# Signatures never change once saved, so browsers may keep them for a year
+SIGNATURE_MAX_AGE = 365 * 24 * 3600
+
 signature_bp = Blueprint("signature", __name__)
 
 
@@ -70,3 +77,60 @@ def supervisor_sign_removed():
     return jsonify({
         "error": "This endpoint has been removed. Use POST /api/admin/supervisor-signoff with authentication.",
     }), 410
+
+
+def _signature_image(stored):
+    """
+    Binary image response for a stored signature (data URL or bare base64),
+    with a strong content ETag and long private caching; 304 on a match.
+    """
+    header, _, encoded = stored.partition(",") if stored.startswith("data:") else ("", "", stored)
+    mimetype = header[5:].split(";")[0] if header else ""
+    try:
+        image = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError):
+        return jsonify({"error": "Stored signature is not valid base64"}), 422
+
+    resp = Response(image, mimetype=mimetype if mimetype.startswith("image/") else "image/png")
+    resp.set_etag(hashlib.sha256(image).hexdigest())
+    resp.cache_control.private = True
+    resp.cache_control.max_age = SIGNATURE_MAX_AGE
+    resp.cache_control.immutable = True
+    return resp.make_conditional(request)
+
+
+@signature_bp.route("/signatures/<int:signoff_id>.png", methods=["GET"])
+@require_admin
+def get_signoff_signature(signoff_id):
+    """Supervisor signoff signature as an image (the list omits the base64)."""
+    try:
+        stored = (
+            db.session.query(SupervisorSignoff.signature_data)
+            .filter(SupervisorSignoff.id == signoff_id)
+            .scalar()
+        )
+        if stored is None:
+            return jsonify({"error": "Signoff not found"}), 404
+        return _signature_image(stored)
+    except Exception as e:
+        return internal_error(e)
+
+
+@signature_bp.route("/jobs/<int:job_id>/signature.png", methods=["GET"])
+@require_auth
+def get_job_signature(job_id):
+    """A job's customer signature as an image; technicians only see their own jobs."""
+    try:
+        row = (
+            db.session.query(JobSignature.signature_data, Job.tech_id)
+            .join(Job, Job.id == JobSignature.job_id)
+            .filter(JobSignature.job_id == job_id)
+            .first()
+        )
+        if row is None:
+            return jsonify({"error": "Signature not found"}), 404
+        if not is_admin() and row.tech_id != g.current_tech_id:
+            return jsonify({"error": "Forbidden"}), 403
+        return _signature_image(row.signature_data)
+    except Exception as e:
+        return internal_error(e)
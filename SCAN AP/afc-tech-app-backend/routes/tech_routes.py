@@ -2,9 +2,12 @@ from flask import Blueprint, request, jsonify
 from models import Technician
 from db import db
 import logging
+
+from flask_limiter.util import get_remote_address
+
 from extensions import limiter
 from middleware.jwt_utils import create_access_token, token_string
-from middleware.pin_utils import hash_pin, is_hashed, verify_pin
+from middleware.pin_utils import PinServiceBusy, hash_pin, needs_rehash, verify_pin
 from middleware.auth import require_admin, require_auth
 from utility.http import internal_error
 
@@ -29,7 +32,7 @@ def get_all_tech():
 
 
 @tech_bp.route("/technicians/login", methods=["POST"])
-@limiter.limit("5 per 15 minutes")
+@limiter.limit("5 per 15 minutes", key_func=get_remote_address)
 def login_technicians():
     try:
         data = request.get_json(silent=True) or {}
@@ -43,10 +46,14 @@ def login_technicians():
         if not tech or not verify_pin(str(pin), tech.pin):
             return jsonify({"error": "Invalid credentials"}), 401
 
-        if not is_hashed(tech.pin):
+        if needs_rehash(tech.pin):
             try:
                 tech.pin = hash_pin(str(pin))
                 db.session.commit()
+            except PinServiceBusy:
+                # The PIN already checked out; upgrade the hash on a quieter login
+                db.session.rollback()
+                logger.info("Skipped PIN rehash for technician %s: hashing busy", tech.id)
             except Exception as hash_err:
                 db.session.rollback()
                 logger.warning(
@@ -64,6 +71,9 @@ def login_technicians():
             "role": role,
             "token": token,
         }), 200
+    except PinServiceBusy:
+        logger.warning("Login rejected: PIN hashing pool saturated")
+        return jsonify({"error": "Login service busy, try again"}), 503
     except Exception as e:
         return internal_error(e)
 
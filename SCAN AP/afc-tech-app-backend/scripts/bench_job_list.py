@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Benchmark the job listing query: joined eager loading vs column projections.
+
+"before" is the old listing query: Job with joinedload of AHU->hospital,
+AHU->building, technician and job_filters->filter (one row per job x filter).
+"after" is the current path in routes/job_routes.py: one tuple per job, then
+the filters in chunked IN queries. For each, the script prints the rows the
+database returned (and rows x columns) and the wall time to build the
+JSON-ready payload.
+
+With --seed N the script builds a throwaway SQLite database with N jobs
+instead of reading DATABASE_URL (the configured database is only read).
+
+Usage:
+  python scripts/bench_job_list.py --seed 100000 [--filters-per-job 8]
+  python scripts/bench_job_list.py [--limit 100] [--no-filters]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _seed(db, n_jobs, filters_per_job):
+    from sqlalchemy import insert
+
+    from models import AHU, Building, Filter, Hospital, Job, JobFilter, Technician
+
+    db.create_all()
+    hospital = Hospital(name="Bench Hospital")
+    db.session.add(hospital)
+    db.session.flush()
+    building = Building(hospital_id=hospital.id, name="Main")
+    techs = [Technician(name=f"Tech {i}", pin="0000") for i in range(10)]
+    db.session.add_all([building, *techs])
+    db.session.flush()
+
+    ahus = [AHU(hospital_id=hospital.id, building_id=building.id, name=f"AHU-{i:03d}") for i in range(200)]
+    db.session.add_all(ahus)
+    db.session.flush()
+    filters_of = {}
+    for ahu in ahus:
+        rows = [Filter(ahu_id=ahu.id, phase=f"P{k}", part_number=f"PN{k}", size="24x24", quantity=1,
+                       frequency_days=90) for k in range(filters_per_job)]
+        db.session.add_all(rows)
+        db.session.flush()
+        filters_of[ahu.id] = [f.id for f in rows]
+
+    start = datetime(2020, 1, 1)
+    job_rows = [{
+        "ahu_id": ahus[i % len(ahus)].id,
+        "tech_id": techs[i % len(techs)].id,
+        "completed_at": start + timedelta(minutes=37 * i),
+    } for i in range(n_jobs)]
+    db.session.execute(insert(Job), job_rows)
+    jf_rows = []
+    for job_id, ahu_id in db.session.query(Job.id, Job.ahu_id):
+        for filter_id in filters_of[ahu_id]:
+            jf_rows.append({"job_id": job_id, "filter_id": filter_id,
+                            "is_completed": random.random() < 0.7, "is_inspected": False, "note": ""})
+    for i in range(0, len(jf_rows), 50000):
+        db.session.execute(insert(JobFilter), jf_rows[i:i + 50000])
+    db.session.commit()
+    print(f"Seeded {n_jobs} jobs / {len(jf_rows)} job_filters")
+
+
+def _before(db, limit, include_filters):
+    from sqlalchemy.orm import joinedload
+
+    from models import AHU, Job, JobFilter
+
+    options = [
+        joinedload(Job.ahu).joinedload(AHU.hospital),
+        joinedload(Job.ahu).joinedload(AHU.building),
+        joinedload(Job.technician),
+    ]
+    if include_filters:
+        options.append(joinedload(Job.job_filters).joinedload(JobFilter.filter))
+    q = Job.query.options(*options).order_by(Job.completed_at.desc(), Job.id.desc())
+    if limit:
+        q = q.limit(limit)
+
+    sql = str(q.statement.compile(db.engine, compile_kwargs={"literal_binds": True}))
+    raw = db.session.connection().exec_driver_sql(sql).fetchall()
+    rows, cells = len(raw), sum(len(r) for r in raw)
+    del raw
+    db.session.expunge_all()
+
+    started = time.perf_counter()
+    payload = []
+    for j in q.all():
+        summary = {
+            "id": j.id,
+            "ahu_id": j.ahu_id,
+            "ahu_name": j.ahu.name if j.ahu else None,
+            "building_id": j.ahu.building.id if j.ahu and j.ahu.building else None,
+            "building_name": j.ahu.building.name if j.ahu and j.ahu.building else None,
+            "hospital_id": j.ahu.hospital.id if j.ahu and j.ahu.hospital else None,
+            "hospital_name": j.ahu.hospital.name if j.ahu and j.ahu.hospital else None,
+            "technician": j.technician.name if j.technician else None,
+            "completed_at": j.completed_at.isoformat(),
+        }
+        if include_filters:
+            summary["filters"] = [
+                {
+                    "filter_id": jf.filter_id,
+                    "phase": jf.filter.phase,
+                    "part_number": jf.filter.part_number,
+                    "size": jf.filter.size,
+                    "is_completed": jf.is_completed,
+                    "note": jf.note,
+                    "initial_resistance": jf.initial_resistance,
+                    "final_resistance": jf.final_resistance,
+                }
+                for jf in j.job_filters
+            ]
+        payload.append(summary)
+    elapsed = time.perf_counter() - started
+    db.session.expunge_all()
+    return rows, cells, elapsed, len(payload)
+
+
+def _after(db, limit, include_filters):
+    from models import Job
+    from routes.job_routes import _job_list_payload, _job_list_query
+
+    started = time.perf_counter()
+    q = _job_list_query().order_by(Job.completed_at.desc(), Job.id.desc())
+    if limit:
+        q = q.limit(limit)
+    job_rows = q.all()
+    payload = _job_list_payload(job_rows, include_filters)
+    elapsed = time.perf_counter() - started
+    filter_rows = sum(len(p.get("filters", [])) for p in payload)
+    rows = len(job_rows) + filter_rows
+    cells = len(job_rows) * len(job_rows[0] if job_rows else ()) + filter_rows * 10
+    return rows, cells, elapsed, len(payload)
+
+
+def run(args):
+    if args.seed:
+        path = os.path.join(tempfile.gettempdir(), "afc_bench_jobs.db")
+        if os.path.exists(path):
+            os.remove(path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        os.environ.setdefault("JWT_SECRET", "bench-only-secret")
+
+    from app import create_app
+    from db import db
+
+    app = create_app()
+    with app.app_context():
+        if args.seed:
+            _seed(db, args.seed, args.filters_per_job)
+
+        include_filters = not args.no_filters
+        for label, fn in (("before", _before), ("after", _after)):
+            rows, cells, elapsed, jobs = fn(db, args.limit, include_filters)
+            print(f"{label:6}: jobs={jobs} rows_transferred={rows} cells={cells} "
+                  f"wall={elapsed * 1000:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="Build a throwaway SQLite DB with N jobs")
+    parser.add_argument("--filters-per-job", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=0, help="Page size (0 = full list)")
+    parser.add_argument("--no-filters", action="store_true", help="Compact listing without filters")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Benchmark login latency under concurrent load while scan traffic runs.
+
+Serves the app in-process on a threaded WSGI server with rate limiting
+disabled. It fires `--logins` logins from `--concurrency` threads while
+`--scanners` threads hit GET /api/qr/<ahu_id> in a loop. Then it prints
+p50/p99 for both, so bcrypt settings (BCRYPT_ROUNDS, BCRYPT_THREADS) can be
+compared. The threaded server stands in for gunicorn's gthread workers
+(gunicorn.conf.py); the numbers do not carry over to sync workers.
+
+Usage:
+  python scripts/bench_login.py --name "John Doe" --pin 1234 --ahu-id 1
+      [--logins 200] [--concurrency 20] [--scanners 4]
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from werkzeug.serving import make_server
+
+from app import create_app
+from extensions import limiter
+
+
+def _request(url, body=None, token=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, method="POST" if body is not None else "GET")
+    req.add_header("Content-Type", "application/json")
+    if token:
+        req.add_header("Authorization", f"Bearer {token}")
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req) as resp:
+            status, payload = resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        status, payload = e.code, e.read()
+    return status, payload, (time.perf_counter() - start) * 1000
+
+
+def _percentiles(samples):
+    if not samples:
+        return "no samples"
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (
+        f"n={len(ordered)} p50={statistics.median(ordered):.1f}ms "
+        f"p99={p99:.1f}ms max={ordered[-1]:.1f}ms"
+    )
+
+
+def run(args):
+    app = create_app()
+    limiter.enabled = False
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}/api"
+
+    login_body = {"name": args.name, "pin": args.pin}
+    status, payload, _ = _request(f"{base}/technicians/login", login_body)
+    if status != 200:
+        print(f"Login failed ({status}): {payload[:200]!r}")
+        server.shutdown()
+        return
+    token = json.loads(payload)["token"]
+
+    stop = threading.Event()
+    scan_ms, scan_errors = [], [0]
+
+    def scanner():
+        while not stop.is_set():
+            status, _, ms = _request(f"{base}/qr/{args.ahu_id}", token=token)
+            if status == 200:
+                scan_ms.append(ms)
+            else:
+                scan_errors[0] += 1
+
+    scanners = [threading.Thread(target=scanner, daemon=True) for _ in range(args.scanners)]
+    for t in scanners:
+        t.start()
+
+    login_ms, login_status = [], {}
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for status, _, ms in pool.map(
+            lambda _: _request(f"{base}/technicians/login", login_body), range(args.logins)
+        ):
+            login_status[status] = login_status.get(status, 0) + 1
+            if status == 200:
+                login_ms.append(ms)
+
+    stop.set()
+    for t in scanners:
+        t.join()
+    server.shutdown()
+
+    print(f"Logins : {_percentiles(login_ms)} statuses={login_status}")
+    print(f"Scans  : {_percentiles(scan_ms)} errors={scan_errors[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--name", required=True, help="Technician name to log in as")
+    parser.add_argument("--pin", required=True, help="Technician PIN")
+    parser.add_argument("--ahu-id", required=True, help="AHU id or label to scan")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scanners", type=int, default=4)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Check that POST /jobs/batch keeps good items when others are malformed.
+
+Builds a throwaway SQLite database (DATABASE_URL is not touched), posts one
+batch that mixes valid jobs with jobs carrying wrongly typed fields, and
+asserts that the bad items get per-item errors while the good ones are
+stored with their filters. Exits non-zero on failure.
+
+Usage:
+  python scripts/check_job_batch.py
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "afc_check_job_batch.db")
+
+
+def _seed(db):
+    from models import AHU, Filter, Hospital, Technician
+
+    db.create_all()
+    hospital = Hospital(name="Check Hospital")
+    db.session.add(hospital)
+    db.session.flush()
+    ahu = AHU(hospital_id=hospital.id, name="AHU-CHECK")
+    tech = Technician(name="Check Tech", pin="0000")
+    db.session.add_all([ahu, tech])
+    db.session.flush()
+    filt = Filter(ahu_id=ahu.id, phase="P1", part_number="PN1", size="24x24", quantity=1,
+                  frequency_days=90)
+    db.session.add(filt)
+    db.session.commit()
+    return ahu.id, filt.id, tech.id
+
+
+def run():
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+    os.environ.setdefault("JWT_SECRET", "check-only-secret-check-only-secret")
+    os.environ["RATELIMIT_STORAGE_URI"] = "memory://"
+
+    from app import create_app
+    from db import db
+    from extensions import limiter
+    from middleware.jwt_utils import create_access_token, token_string
+    from models import Job, JobFilter
+
+    app = create_app()
+    limiter.enabled = False
+    with app.app_context():
+        ahu_id, filter_id, tech_id = _seed(db)
+        token = token_string(create_access_token(tech_id, "technician"))
+
+    def job(local_id, **filter_fields):
+        return {
+            "ahu_id": ahu_id,
+            "local_id": local_id,
+            "filters": [{"filter_id": filter_id, "is_completed": True, **filter_fields}],
+        }
+
+    batch = [
+        job("good-1", note="swapped", initial_resistance="0.45"),
+        job("bad-flag", is_completed="sometimes"),
+        job("coerced", is_completed="yes", is_inspected=0),
+        job("bad-note", note={"x": 1}),
+        {**job("bad-gps"), "gps_lat": [1, 2]},
+        {**job("bad-filters"), "filters": 5},
+        {**job("bool-filters"), "filters": True},
+    ]
+    resp = app.test_client().post(
+        "/api/jobs/batch", json=batch, headers={"Authorization": f"Bearer {token}"}
+    )
+    body = resp.get_json()
+    print(resp.status_code, {k: body.get(k) for k in ("created", "duplicates", "failed")})
+    for item in body.get("results", []):
+        print("  ", item)
+
+    assert resp.status_code == 200, "batch must not fail as a whole"
+    assert body["created"] == 2 and body["failed"] == 5, "expected 2 stored, 5 rejected"
+    by_local = {item["local_id"]: item for item in body["results"]}
+    assert by_local["good-1"]["ok"] and by_local["coerced"]["ok"]
+    assert "is_completed" in by_local["bad-flag"]["error"]
+    assert "note" in by_local["bad-note"]["error"]
+    assert "gps_lat" in by_local["bad-gps"]["error"]
+    assert "filters must be a list" in by_local["bad-filters"]["error"]
+    assert "filters must be a list" in by_local["bool-filters"]["error"]
+
+    single = app.test_client().post(
+        "/api/jobs", json={**job("single-bad-filters"), "filters": True},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert single.status_code == 400, f"POST /jobs with non-list filters -> {single.status_code}"
+
+    with app.app_context():
+        stored = {j.local_id: j for j in Job.query.all()}
+        assert set(stored) == {"good-1", "coerced"}, f"stored jobs: {sorted(stored)}"
+        jf = JobFilter.query.filter_by(job_id=stored["good-1"].id).one()
+        assert jf.is_completed is True and jf.initial_resistance == 0.45 and jf.note == "swapped"
+    print("OK: good items stored, malformed items rejected individually")
+
+
+if __name__ == "__main__":
+    try:
+        run()
+    except AssertionError as e:
+        print(f"FAILED: {e}")
+        sys.exit(1)
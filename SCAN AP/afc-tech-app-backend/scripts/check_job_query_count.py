@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Guard against N+1 regressions in job creation by counting SQL statements.
+
+Builds a throwaway SQLite database (DATABASE_URL is not touched) with AHUs
+of 1, 5 and 20 filters. It hooks SQLAlchemy's before_cursor_execute, posts
+one job per AHU to POST /jobs (every filter replaced, with a note), and
+posts batches of 1 and 10 jobs to POST /jobs/batch. It asserts that the
+statement count per request does not grow with the number of filters or
+jobs. Exits non-zero on failure.
+
+The jobs themselves are one multi-row INSERT where the dialect can return
+autoincrement ids in order (PostgreSQL). SQLite can't, so SQLAlchemy sends
+one INSERT per job there, and those are counted as a single statement.
+
+Usage:
+  python scripts/check_job_query_count.py
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "afc_check_job_queries.db")
+FILTER_COUNTS = (1, 5, 20)
+BATCH_SIZES = (1, 10)
+
+
+def _seed(db):
+    from models import AHU, Filter, Hospital, Technician
+
+    db.create_all()
+    hospital = Hospital(name="Check Hospital")
+    tech = Technician(name="Check Tech", pin="0000")
+    db.session.add_all([hospital, tech])
+    db.session.flush()
+    filters_of = {}
+    for n in FILTER_COUNTS + (2,):
+        ahu = AHU(hospital_id=hospital.id, name=f"AHU-{n:03d}")
+        db.session.add(ahu)
+        db.session.flush()
+        rows = [Filter(ahu_id=ahu.id, phase=f"P{k}", part_number=f"PN{k}", size="24x24",
+                       quantity=1, frequency_days=90) for k in range(n)]
+        db.session.add_all(rows)
+        db.session.flush()
+        filters_of[n] = (ahu.id, [f.id for f in rows])
+    db.session.commit()
+    return filters_of, tech.id
+
+
+@contextmanager
+def _count_statements(engine, sink):
+    from sqlalchemy import event
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        sink.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        yield sink
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+
+def _job(ahu_id, filter_ids):
+    return {
+        "ahu_id": ahu_id,
+        "overall_notes": "checked",
+        "filters": [{"filter_id": fid, "is_completed": True, "note": "replaced"} for fid in filter_ids],
+    }
+
+
+def run():
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+    os.environ.setdefault("JWT_SECRET", "check-only-secret-check-only-secret")
+    os.environ["RATELIMIT_STORAGE_URI"] = "memory://"
+
+    from app import create_app
+    from db import db
+    from extensions import limiter
+    from middleware.jwt_utils import create_access_token, token_string
+
+    app = create_app()
+    limiter.enabled = False
+    client = app.test_client()
+    with app.app_context():
+        filters_of, tech_id = _seed(db)
+        token = token_string(create_access_token(tech_id, "technician"))
+        engine = db.engine
+    headers = {"Authorization": f"Bearer {token}"}
+
+    from sqlalchemy.engine.default import InsertmanyvaluesSentinelOpts
+
+    batches_job_inserts = bool(
+        engine.dialect.insertmanyvalues_implicit_sentinel & InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT
+    )
+
+    def post(path, body):
+        statements = []
+        with _count_statements(engine, statements):
+            resp = client.post(path, json=body, headers=headers)
+        assert resp.status_code in (200, 201), f"{path} -> {resp.status_code}: {resp.get_data(as_text=True)}"
+        job_inserts = sum(1 for sql in statements if sql.lstrip().startswith("INSERT INTO jobs "))
+        if not batches_job_inserts and job_inserts > 1:
+            return len(statements) - (job_inserts - 1)
+        return len(statements)
+
+    # Warm-up: identity cache and the once-a-day event prune
+    post("/api/jobs", _job(*filters_of[2]))
+
+    single = {n: post("/api/jobs", _job(*filters_of[n])) for n in FILTER_COUNTS}
+    ahu_id, filter_ids = filters_of[20]
+    batch = {size: post("/api/jobs/batch", [_job(ahu_id, filter_ids)] * size) for size in BATCH_SIZES}
+
+    if not batches_job_inserts:
+        print(f"({engine.dialect.name}: per-row job INSERTs counted as one statement)")
+    for n, count in single.items():
+        print(f"POST /jobs        filters={n:<3} statements={count}")
+    for size, count in batch.items():
+        print(f"POST /jobs/batch  jobs={size:<6} statements={count}")
+
+    assert len(set(single.values())) == 1, f"statements grow with filters: {single}"
+    assert len(set(batch.values())) == 1, f"statements grow with batch size: {batch}"
+    print("OK: statement count is independent of filter and job count")
+
+
+if __name__ == "__main__":
+    try:
+        run()
+    except AssertionError as e:
+        print(f"FAILED: {e}")
+        sys.exit(1)
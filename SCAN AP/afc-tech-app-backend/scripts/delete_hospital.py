@@ -18,8 +18,8 @@ if ROOT not in sys.path:
 from app import create_app
 from db import db
 from models import (
-    Hospital, Building, AHU, Job, JobFilter, JobSignature,
-    Filter, Notification, SupervisorSignoff
+    Hospital, Building, AHU, AHUStatusRollup, Job, JobFilter, JobSignature,
+    Filter, Notification, SupervisorSignoff, SupervisorSignoffJob
 )
 
 
@@ -64,9 +64,18 @@ def delete_hospital(session, hospital, building_ids, ahu_ids, job_ids):
                                            Notification.ahu_id.in_(ahu_ids) if ahu_ids else False,
                                            Notification.job_id.in_(job_ids) if job_ids else False)).delete(synchronize_session=False)
 
-    # Delete supervisor signoffs for hospital
+    # Delete signoff <-> job links, then supervisor signoffs for hospital
+    signoff_ids = session.query(SupervisorSignoff.id).filter_by(hospital_id=hid)
+    session.query(SupervisorSignoffJob).filter(or_(
+        SupervisorSignoffJob.signoff_id.in_(signoff_ids),
+        SupervisorSignoffJob.job_id.in_(job_ids) if job_ids else False,
+    )).delete(synchronize_session=False)
     session.query(SupervisorSignoff).filter_by(hospital_id=hid).delete(synchronize_session=False)
 
+    # Delete status rollups (they reference both AHUs and jobs)
+    if ahu_ids:
+        session.query(AHUStatusRollup).filter(AHUStatusRollup.ahu_id.in_(ahu_ids)).delete(synchronize_session=False)
+
     # Explicitly delete job_signatures and job_filters (redundant if cascades are configured)
     if job_ids:
         session.query(JobSignature).filter(JobSignature.job_id.in_(job_ids)).delete(synchronize_session=False)
@@ -10,6 +10,7 @@ import openpyxl
 from app import app
 from db import db
 from models import Hospital, AHU, Filter, Building
+from utility.rollup import refresh_ahu_rollups
 
 
 EXCEL_PATH = "./excel_data_raw/filter-datasheet.xlsm"
@@ -278,6 +279,7 @@ def upsert_filter(
         if excel_order is not None and has_attr(existing, "excel_order"):
             existing.excel_order = int(excel_order)
 
+        existing.sync_next_due_date()
         return existing
 
     if frequency_days is None:
@@ -298,6 +300,7 @@ def upsert_filter(
         kwargs["excel_order"] = int(excel_order)
 
     f = Filter(**kwargs)
+    f.sync_next_due_date()
     db.session.add(f)
     return f
 
@@ -536,6 +539,7 @@ def seed_from_excel(path, selected_sheet=None):
                 )
                 stats["filters_upserted"] += 1
 
+    refresh_ahu_rollups(stats["ahus"])
     db.session.commit()
 
     print("\n✅ Seed complete")
@@ -1,6 +1,7 @@
 from db import db
 from app import create_app
 from models import Hospital, AHU, Filter, Technician
+from utility.rollup import refresh_ahu_rollups
 from datetime import date, timedelta
 import random
 
@@ -121,7 +122,11 @@ def seed_data():
                     )
                 )
 
+        for f in filters:
+            f.sync_next_due_date()
         db.session.add_all(filters)
+        db.session.flush()
+        refresh_ahu_rollups()
 
         # -------------------------------------------------
         # TECHNICIANS
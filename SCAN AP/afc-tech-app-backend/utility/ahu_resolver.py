@@ -0,0 +1,51 @@
+"""Resolve scanned AHU identifiers (numeric ids or legacy "AHU-001" labels) to ids."""
+import os
+
+from sqlalchemy import func
+
+from db import db
+from models import AHU
+from utility.cache import LRUCache
+
+# normalized label -> AHU id; misses are not cached so new AHUs resolve at once
+_label_cache = LRUCache(
+    maxsize=int(os.getenv("AHU_LABEL_CACHE_SIZE", "8192")),
+    ttl=float(os.getenv("AHU_LABEL_CACHE_TTL_SECONDS", "600")),
+)
+
+
+def normalize_label(label):
+    """Matches the ix_ahus_name_lower expression index: lower(name)."""
+    return str(label).strip().lower()
+
+
+def resolve_ahu_id(raw):
+    """
+    Numeric ids pass through untouched. Legacy labels are matched
+    case-insensitively against ahus.name through the lower(name) index and
+    memoized in-process. Returns None when nothing matches.
+    """
+    if raw is None:
+        return None
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        pass
+
+    key = normalize_label(raw)
+    if not key:
+        return None
+
+    aid = _label_cache.get(key)
+    if aid is None:
+        aid = (
+            db.session.query(AHU.id)
+            .filter(func.lower(AHU.name) == key)
+            .order_by(AHU.id.asc())
+            .limit(1)
+            .scalar()
+        )
+        if aid is not None:
+            _label_cache.set(key, aid)
+    return aid
+
@@ -0,0 +1,120 @@
+"""
+Set-based backfill of Filter.last_service_date from job history.
+
+The filters table is walked in id ranges. Each range is a single
+UPDATE ... FROM (newest inspected-or-replaced job per filter) that also
+recomputes next_due_date, followed by the rollup refresh for the AHUs it
+touched, and is committed on its own so no transaction spans the table.
+"""
+from sqlalchemy import Date, String, and_, case, cast, func, or_, select, update
+
+from db import db
+from models import Filter, Job, JobFilter
+from utility.cache import invalidate_qr_payload
+from utility.events import emit_admin_events
+from utility.rollup import refresh_ahu_rollups
+
+BACKFILL_CHUNK = 5000
+MAX_BACKFILL_CHUNK = 50000
+MAX_BACKFILL_SAMPLE = 500
+
+
+def _latest_service_days(lo, hi):
+    """filter_id -> day of its newest inspected or replaced job, for lo <= filter_id < hi."""
+    return (
+        select(
+            JobFilter.filter_id.label("filter_id"),
+            func.date(func.max(Job.completed_at), type_=Date).label("served_on"),
+        )
+        .join(Job, Job.id == JobFilter.job_id)
+        .where(
+            JobFilter.filter_id >= lo,
+            JobFilter.filter_id < hi,
+            or_(JobFilter.is_inspected.is_(True), JobFilter.is_completed.is_(True)),
+        )
+        .group_by(JobFilter.filter_id)
+        .subquery()
+    )
+
+
+def _next_due_sql(served_on):
+    """SQL twin of models.compute_next_due_date(served_on, Filter.frequency_days)."""
+    if db.session.get_bind().dialect.name == "sqlite":
+        shifted = func.date(served_on, cast(Filter.frequency_days, String) + " days", type_=Date)
+    else:
+        shifted = served_on + Filter.frequency_days
+    return case((Filter.frequency_days != 0, shifted), else_=None)
+
+
+def backfill_filter_service_dates(chunk_size=BACKFILL_CHUNK, sample=0, progress=None, today=None):
+    """
+    Move each filter's last_service_date forward to its newest inspected or
+    replaced job (never backwards) and recompute next_due_date, committing
+    one filter-id range of `chunk_size` at a time.
+
+    Returns {"updated", "chunks", "ahus", "sample"} where `sample` holds at
+    most `sample` changed rows (capped at MAX_BACKFILL_SAMPLE). When given,
+    `progress(through_id, max_id, updated)` is called after every chunk.
+    """
+    chunk_size = max(1, min(int(chunk_size), MAX_BACKFILL_CHUNK))
+    sample = max(0, min(int(sample or 0), MAX_BACKFILL_SAMPLE))
+    result = {"updated": 0, "chunks": 0, "ahus": 0, "sample": []}
+
+    min_id, max_id = db.session.query(func.min(Filter.id), func.max(Filter.id)).one()
+    if min_id is None:
+        return result
+
+    touched = set()
+    for lo in range(min_id, max_id + 1, chunk_size):
+        latest = _latest_service_days(lo, lo + chunk_size)
+        stale = and_(
+            Filter.id == latest.c.filter_id,
+            or_(Filter.last_service_date.is_(None), latest.c.served_on > Filter.last_service_date),
+        )
+
+        room = sample - len(result["sample"])
+        if room > 0:
+            rows = db.session.execute(
+                select(Filter.id, Filter.ahu_id, Filter.last_service_date, latest.c.served_on)
+                .where(stale)
+                .order_by(Filter.id)
+                .limit(room)
+            )
+            result["sample"].extend(
+                {
+                    "filter_id": filter_id,
+                    "ahu_id": ahu_id,
+                    "old_date": old_date.isoformat() if old_date else None,
+                    "new_date": new_date.isoformat(),
+                }
+                for filter_id, ahu_id, old_date, new_date in rows
+            )
+
+        changed = db.session.execute(
+            update(Filter)
+            .where(stale)
+            .values(last_service_date=latest.c.served_on, next_due_date=_next_due_sql(latest.c.served_on))
+            .returning(Filter.ahu_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        per_ahu = {}
+        for (ahu_id,) in changed:
+            per_ahu[ahu_id] = per_ahu.get(ahu_id, 0) + 1
+        if per_ahu:
+            refresh_ahu_rollups(per_ahu, today)
+            emit_admin_events(
+                ("filter.updated", {"ahu_id": ahu_id, "action": "backfilled", "filters": n})
+                for ahu_id, n in per_ahu.items()
+            )
+        db.session.commit()
+        invalidate_qr_payload(*per_ahu)
+
+        touched.update(per_ahu)
+        result["updated"] += len(changed)
+        result["chunks"] += 1
+        if progress:
+            progress(min(lo + chunk_size - 1, max_id), max_id, result["updated"])
+
+    result["ahus"] = len(touched)
+    return result
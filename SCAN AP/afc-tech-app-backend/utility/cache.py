@@ -0,0 +1,121 @@
+"""Small in-process caches (per worker; bounded, thread-safe)."""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+
+class LRUCache:
+    """
+    Bounded LRU map with an optional per-entry TTL. Each gunicorn worker has
+    its own instance, so writers invalidate locally and the TTL bounds how
+    long another worker can serve a stale entry.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate):
+        """Drop every entry whose key matches `predicate`; returns how many."""
+        with self._lock:
+            doomed = [key for key in self._data if predicate(key)]
+            for key in doomed:
+                del self._data[key]
+        return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# ---------------------------------------------------
+# QR scan payloads (GET /qr/<ahu_id>), keyed by AHU id
+# ---------------------------------------------------
+qr_payload_cache = LRUCache(
+    maxsize=int(os.getenv("QR_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("QR_CACHE_TTL_SECONDS", "60")),
+)
+
+
+def get_qr_payload(ahu_id):
+    """Cached scan payload for today, or None (due-date fields roll at midnight)."""
+    entry = qr_payload_cache.get(ahu_id)
+    if entry is None:
+        return None
+    day, payload = entry
+    if day != date.today():
+        qr_payload_cache.invalidate(ahu_id)
+        return None
+    return payload
+
+
+def set_qr_payload(ahu_id, payload):
+    qr_payload_cache.set(ahu_id, (date.today(), payload))
+
+
+def invalidate_qr_payload(*ahu_ids):
+    """Drop cached scan payloads; call after the write has committed."""
+    for ahu_id in ahu_ids:
+        qr_payload_cache.invalidate(ahu_id)
+
+
+# ---------------------------------------------------
+# Fleet overview (GET /admin/overview), keyed by day
+# ---------------------------------------------------
+overview_cache = LRUCache(
+    maxsize=4,
+    ttl=float(os.getenv("OVERVIEW_CACHE_TTL_SECONDS", "30")),
+)
+
+
+# ---------------------------------------------------
+# Packing-slip lines (GET /admin/packing-slip/lines),
+# keyed by (hospital_id, from, to, mode, job stamp). The stamp is read from
+# the database on every request, so a job landing through any worker changes
+# the key; the short TTL bounds filter edits made on another worker.
+# ---------------------------------------------------
+packing_slip_cache = LRUCache(
+    maxsize=int(os.getenv("PACKING_SLIP_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("PACKING_SLIP_CACHE_TTL_SECONDS", "30")),
+)
+
+
+def invalidate_packing_slips(hospital_id, day=None):
+    """
+    Drop cached slips for `hospital_id` whose window contains `day` (all of
+    the hospital's windows when None); call after the write has committed.
+    """
+    return packing_slip_cache.invalidate_where(
+        lambda key: key[0] == hospital_id and (day is None or key[1] <= day <= key[2])
+    )
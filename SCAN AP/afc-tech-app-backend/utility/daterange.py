@@ -0,0 +1,23 @@
+"""Sargable date windows over timestamp columns."""
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import and_
+
+
+def day_bounds(start, end):
+    """Inclusive (start, end) dates -> half-open [start 00:00, end+1 00:00) datetimes."""
+    return (
+        datetime.combine(start, time.min),
+        datetime.combine(end + timedelta(days=1), time.min),
+    )
+
+
+def within_days(column, start, end):
+    """
+    `column` falls on a day between start and end (inclusive).
+
+    Same rows as func.date(column) BETWEEN start AND end, but compares the
+    bare column so an index on it can be used.
+    """
+    lo, hi = day_bounds(start, end)
+    return and_(column >= lo, column < hi)
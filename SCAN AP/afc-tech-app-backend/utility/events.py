@@ -0,0 +1,107 @@
+"""
+Admin change feed (GET /admin/events).
+
+Events are inserted in the writer's transaction, so they appear exactly when
+the change commits and are visible to every worker. The event id doubles as
+the SSE Last-Event-ID cursor. Payloads stay compact (ids and a few fields);
+clients re-fetch the rows they care about.
+"""
+import json
+import os
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, insert
+
+from db import db
+from models import AdminEvent
+
+EVENT_RETENTION_DAYS = int(os.getenv("ADMIN_EVENT_RETENTION_DAYS", "7"))
+# How long a hole in the id sequence is re-scanned before a feed moves past it
+EVENT_GAP_GRACE_SECONDS = float(os.getenv("ADMIN_EVENT_GAP_GRACE_SECONDS", "10"))
+
+# Day expired events were last pruned in this process
+_pruned_on = None
+
+
+def emit_admin_events(events):
+    """Queue (kind, payload dict) pairs in the current transaction; the caller commits."""
+    rows = [
+        {"kind": kind, "payload": json.dumps(payload, default=str), "created_at": datetime.utcnow()}
+        for kind, payload in events
+    ]
+    if rows:
+        db.session.execute(insert(AdminEvent), rows)
+    _prune_admin_events()
+
+
+def emit_admin_event(kind, **payload):
+    emit_admin_events([(kind, payload)])
+
+
+def admin_events_after(last_id, limit=500):
+    """Events with id > last_id, oldest first, as (id, kind, payload_json, created_at)."""
+    return (
+        db.session.query(AdminEvent.id, AdminEvent.kind, AdminEvent.payload, AdminEvent.created_at)
+        .filter(AdminEvent.id > last_id)
+        .order_by(AdminEvent.id.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+class AdminEventCursor:
+    """
+    What one feed client has been sent. Ids are assigned at insert, not at
+    commit, so a slow writer can commit id N after N+1 was streamed.
+    `position` (the resume point handed to the client) therefore only moves
+    over contiguous ids; a hole is re-read on every poll until it fills or
+    has been open EVENT_GAP_GRACE_SECONDS (rolled-back inserts never fill).
+    Ids above `position` already sent are remembered and not repeated.
+    """
+
+    def __init__(self, position, sent=()):
+        self.position = position
+        self._sent = set(sent)
+        self._gaps = {}  # missing id -> time.monotonic() when first noticed
+
+    @classmethod
+    def starting_now(cls):
+        """Skip what has already committed, but still catch late commits from the grace window."""
+        cutoff = datetime.utcnow() - timedelta(seconds=EVENT_GAP_GRACE_SECONDS)
+        position = (
+            db.session.query(func.max(AdminEvent.id)).filter(AdminEvent.created_at < cutoff).scalar()
+            or 0
+        )
+        sent = [event_id for (event_id,) in db.session.query(AdminEvent.id).filter(AdminEvent.id > position)]
+        return cls(position, sent)
+
+    def poll(self, now, limit=500):
+        """New events (same tuples as admin_events_after), then advance `position`."""
+        fresh = [row for row in admin_events_after(self.position, limit) if row[0] not in self._sent]
+        self._sent.update(row[0] for row in fresh)
+
+        top = max(self._sent, default=self.position)
+        for missing in range(self.position + 1, top):
+            if missing not in self._sent:
+                self._gaps.setdefault(missing, now)
+        while self.position < top:
+            nxt = self.position + 1
+            if nxt not in self._sent and now - self._gaps.get(nxt, now) < EVENT_GAP_GRACE_SECONDS:
+                break
+            self._sent.discard(nxt)
+            self._gaps.pop(nxt, None)
+            self.position = nxt
+        return fresh
+
+
+def _prune_admin_events():
+    """Drop events past the retention window, once per process per day."""
+    global _pruned_on
+    today = date.today()
+    if _pruned_on == today:
+        return
+    cutoff = datetime.utcnow() - timedelta(days=EVENT_RETENTION_DAYS)
+    db.session.query(AdminEvent).filter(AdminEvent.created_at < cutoff).delete(
+        synchronize_session=False
+    )
+    _pruned_on = today
@@ -0,0 +1,40 @@
+"""Keyset (cursor) pagination helpers."""
+import base64
+import json
+from datetime import date, datetime
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values):
+    """Opaque cursor for the sort key of the last row on a page."""
+    raw = json.dumps([
+        v.isoformat() if isinstance(v, (date, datetime)) else v for v in values
+    ])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """Inverse of encode_cursor; raises ValueError on anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_limit(raw, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Page size from a query arg; raises ValueError when not a positive int."""
+    if raw is None or raw == "":
+        return default
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        limit = 0
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, maximum)
@@ -0,0 +1,122 @@
+"""
+SQLite-file rate limit storage shared by every gunicorn worker on a host.
+
+Importing this module registers the ``sqlite://`` scheme with the `limits`
+library, e.g. ``RATELIMIT_STORAGE_URI=sqlite:////tmp/afc_ratelimit.db``.
+Only fixed-window counters are supported (Flask-Limiter's default strategy).
+Expired windows are purged periodically so the file stays small.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from limits.storage import Storage
+
+_PURGE_EVERY = 500  # incr calls between purges of expired windows
+
+
+class SQLiteStorage(Storage):
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        path = (uri or "").split("://", 1)[-1]
+        if path.startswith("/") and path[1:2] == "/":
+            path = path[1:]  # sqlite:////abs/path -> /abs/path
+        if not path:
+            raise ValueError("sqlite rate limit storage needs a file path")
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_rate_limits_expires_at ON rate_limits (expires_at)"
+            )
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _conn(self):
+        # One connection per thread per process (gunicorn forks after import)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _purge(self, conn, now):
+        self._calls += 1
+        if self._calls % _PURGE_EVERY == 0:
+            conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM rate_limits WHERE key = ? AND expires_at <= ?", (key, now)
+            )
+            conn.execute(
+                "INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET count = count + excluded.count",
+                (key, amount, now + expiry),
+            )
+            if elastic_expiry:
+                conn.execute(
+                    "UPDATE rate_limits SET expires_at = ? WHERE key = ?", (now + expiry, key)
+                )
+            count = conn.execute(
+                "SELECT count FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()[0]
+            self._purge(conn, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+    def decr(self, key, amount=1):
+        conn = self._conn()
+        conn.execute(
+            "UPDATE rate_limits SET count = MAX(count - ?, 0) WHERE key = ? AND expires_at > ?",
+            (amount, key, time.time()),
+        )
+        return self.get(key)
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        row = self._conn().execute(
+            "SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self):
+        try:
+            self._conn().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        cur = self._conn().execute("DELETE FROM rate_limits")
+        return cur.rowcount
+
+    def clear(self, key):
+        self._conn().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
@@ -0,0 +1,98 @@
+"""Incremental maintenance of the ahu_status_rollup table."""
+from datetime import date, timedelta
+
+from sqlalchemy import case, func
+
+from db import db
+from models import AHU, AHUStatusRollup, Filter
+from utility.status import DUE_SOON_DAYS, due_soon_clause, overdue_clause
+
+# Day the rollover pass last ran in this process
+_rolled_over_on = None
+
+
+def ahu_status_aggregate(today=None):
+    """One GROUP BY over active filters: counts, earliest next-due, latest service."""
+    today = today or date.today()
+    return (
+        db.session.query(
+            Filter.ahu_id.label("ahu_id"),
+            func.count(Filter.id).label("filters_count"),
+            func.sum(case((overdue_clause(Filter.next_due_date, today), 1), else_=0)).label("overdue_count"),
+            func.sum(case((due_soon_clause(Filter.next_due_date, today), 1), else_=0)).label("due_soon_count"),
+            func.min(Filter.next_due_date).label("min_next_due"),
+            func.max(Filter.last_service_date).label("last_serviced"),
+        )
+        .filter(Filter.is_active.is_(True))
+        .group_by(Filter.ahu_id)
+    )
+
+
+def refresh_ahu_rollups(ahu_ids=None, today=None, last_job_id=None, last_job_ids=None):
+    """
+    Recompute rollup rows for `ahu_ids` (all AHUs when None) inside the
+    caller's transaction; the caller commits. `last_job_id` is recorded on
+    every refreshed row when given; `last_job_ids` maps ahu_id -> job id
+    for batch writes.
+    """
+    today = today or date.today()
+    agg = ahu_status_aggregate(today)
+    existing = AHUStatusRollup.query
+    if ahu_ids is not None:
+        ahu_ids = sorted({int(a) for a in ahu_ids if a is not None})
+        if not ahu_ids:
+            return 0
+        agg = agg.filter(Filter.ahu_id.in_(ahu_ids))
+        existing = existing.filter(AHUStatusRollup.ahu_id.in_(ahu_ids))
+    else:
+        ahu_ids = [aid for (aid,) in db.session.query(AHU.id)]
+
+    stats = {row.ahu_id: row for row in agg.all()}
+    rollups = {r.ahu_id: r for r in existing.all()}
+
+    for aid in ahu_ids:
+        r = rollups.get(aid)
+        if r is None:
+            r = AHUStatusRollup(ahu_id=aid)
+            db.session.add(r)
+        row = stats.get(aid)
+        r.filters_count = int(row.filters_count) if row else 0
+        r.overdue_count = int(row.overdue_count or 0) if row else 0
+        r.due_soon_count = int(row.due_soon_count or 0) if row else 0
+        r.min_next_due = row.min_next_due if row else None
+        r.last_serviced = row.last_serviced if row else None
+        r.computed_on = today
+        if last_job_id is not None:
+            r.last_job_id = last_job_id
+        elif last_job_ids and aid in last_job_ids:
+            r.last_job_id = last_job_ids[aid]
+
+    return len(ahu_ids)
+
+
+def roll_over_ahu_rollups(today=None):
+    """
+    Refresh time-dependent counts once per day. Only AHUs whose earliest
+    next-due falls on or before the due-soon horizon can change, so the rest
+    just get their computed_on stamp moved forward. Commits.
+    """
+    global _rolled_over_on
+    today = today or date.today()
+    if _rolled_over_on == today:
+        return 0
+
+    stale = AHUStatusRollup.computed_on < today
+    changed = [
+        aid for (aid,) in db.session.query(AHUStatusRollup.ahu_id).filter(
+            stale,
+            AHUStatusRollup.min_next_due <= today + timedelta(days=DUE_SOON_DAYS),
+        )
+    ]
+    refresh_ahu_rollups(changed, today)
+    db.session.query(AHUStatusRollup).filter(stale).update(
+        {AHUStatusRollup.computed_on: today}, synchronize_session=False
+    )
+    db.session.commit()
+
+    _rolled_over_on = today
+    return len(changed)
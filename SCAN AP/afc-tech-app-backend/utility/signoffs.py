@@ -0,0 +1,50 @@
+"""Supervisor signoff <-> job links (supervisor_signoff_jobs)."""
+import re
+
+from sqlalchemy import insert
+
+from db import db
+from models import AHU, Job, SupervisorSignoffJob
+
+_JOB_ID_TOKEN = re.compile(r"\d+")
+
+
+def parse_job_ids(raw):
+    """
+    Job ids from a signoff's job_ids value (list or comma-separated string),
+    deduplicated in order. Tokens that are not plain integers are skipped,
+    as the free-text field has always allowed.
+    """
+    if raw is None:
+        return []
+    tokens = raw if isinstance(raw, (list, tuple)) else str(raw).split(",")
+    seen = {}
+    for token in tokens:
+        token = str(token).strip().lstrip("#")
+        if _JOB_ID_TOKEN.fullmatch(token):
+            seen.setdefault(int(token), None)
+    return list(seen)
+
+
+def link_signoff_jobs(signoff_id, hospital_id, job_ids):
+    """
+    Insert supervisor_signoff_jobs rows for the ids that are jobs of
+    `hospital_id` (unknown or other-hospital ids are dropped) in the
+    current transaction; returns the linked job ids.
+    """
+    job_ids = list(job_ids)
+    if not job_ids:
+        return []
+    linked = [
+        job_id
+        for (job_id,) in db.session.query(Job.id)
+        .join(AHU, AHU.id == Job.ahu_id)
+        .filter(Job.id.in_(job_ids), AHU.hospital_id == hospital_id)
+        .order_by(Job.id)
+    ]
+    if linked:
+        db.session.execute(
+            insert(SupervisorSignoffJob),
+            [{"signoff_id": signoff_id, "job_id": job_id} for job_id in linked],
+        )
+    return linked
@@ -1,5 +1,16 @@
 from datetime import date, timedelta
 
+import numpy as np
+
+DUE_SOON_DAYS = 7
+
+# Status codes used by the batch engine (ordered by severity)
+PENDING, COMPLETED, DUE_SOON, OVERDUE = 0, 1, 2, 3
+STATUS_LABELS = ("Pending", "Completed", "Due Soon", "Overdue")
+
+_NO_DUE = np.iinfo(np.int64).max
+
+
 def compute_filter_status(filter):
     if not filter.last_service_date or not filter.frequency_days:
         return {
@@ -34,3 +45,233 @@ def compute_filter_status(filter):
         "days_until_due": (next_due - today).days,
         "days_overdue": 0,
     }
+
+
+def pending_status():
+    return {
+        "status": "Pending",
+        "next_due_date": None,
+        "days_until_due": None,
+        "days_overdue": None,
+    }
+
+
+def empty_ahu_status():
+    """Rollup for an AHU that has no (active) filters."""
+    return {
+        **pending_status(),
+        "overdue_count": 0,
+        "due_soon_count": 0,
+        "filters_count": 0,
+        "last_serviced": None,
+    }
+
+
+# ---------------------------------------------------
+# SQL predicates on the stored Filter.next_due_date (index range scans)
+# ---------------------------------------------------
+def overdue_clause(next_due_column, today=None):
+    today = today or date.today()
+    return next_due_column < today
+
+
+def due_soon_clause(next_due_column, today=None):
+    today = today or date.today()
+    return next_due_column.between(today, today + timedelta(days=DUE_SOON_DAYS))
+
+
+def ahu_status_from_min_next_due(min_next_due, today=None):
+    """
+    AHU status from the earliest next_due_date of its active filters.
+
+    Equivalent to rolling up compute_filter_status per filter: the earliest
+    due date decides overdue / due soon and carries both day counts.
+    """
+    if not min_next_due:
+        return pending_status()
+
+    today = today or date.today()
+    delta = (min_next_due - today).days
+    if delta < 0:
+        status, days_until, days_overdue = "Overdue", 0, -delta
+    elif delta <= DUE_SOON_DAYS:
+        status, days_until, days_overdue = "Due Soon", delta, 0
+    else:
+        status, days_until, days_overdue = "Completed", delta, 0
+
+    return {
+        "status": status,
+        "next_due_date": min_next_due.isoformat(),
+        "days_until_due": days_until,
+        "days_overdue": days_overdue,
+    }
+
+
+# ---------------------------------------------------
+# Batch engine
+# ---------------------------------------------------
+def _date_array(values):
+    return np.array(
+        [v if v else None for v in values], dtype="datetime64[D]"
+    )
+
+
+def _day_iso(day):
+    return str(np.datetime64(int(day), "D"))
+
+
+def filter_status_arrays(last_service_dates, frequency_days, today=None):
+    """
+    Vectorized compute_filter_status over parallel sequences.
+
+    Returns a dict of NumPy arrays: `code` (PENDING/COMPLETED/DUE_SOON/OVERDUE),
+    `next_due` (days since epoch, only meaningful where `has_due`),
+    `days_until_due`, `days_overdue` and `last_service` (days since epoch,
+    NaT-safe via `has_last`).
+    """
+    today = today or date.today()
+    today_day = np.datetime64(today, "D").astype(np.int64)
+
+    last = _date_array(last_service_dates)
+    freq = np.array(
+        [int(v) if v else 0 for v in frequency_days], dtype=np.int64
+    )
+
+    has_last = ~np.isnat(last)
+    has_due = has_last & (freq > 0)
+    last_days = np.where(has_last, last.astype(np.int64), 0)
+    next_due = np.where(has_due, last_days + freq, 0)
+
+    delta = next_due - today_day
+    overdue = has_due & (delta < 0)
+    due_soon = has_due & ~overdue & (delta <= DUE_SOON_DAYS)
+
+    code = np.full(len(freq), PENDING, dtype=np.int8)
+    code[has_due] = COMPLETED
+    code[due_soon] = DUE_SOON
+    code[overdue] = OVERDUE
+
+    return {
+        "code": code,
+        "has_due": has_due,
+        "has_last": has_last,
+        "next_due": next_due,
+        "last_service": last_days,
+        "days_until_due": np.where(overdue, 0, delta),
+        "days_overdue": np.where(overdue, -delta, 0),
+    }
+
+
+def compute_filter_statuses(filters, today=None):
+    """Batch equivalent of compute_filter_status for a list of filters."""
+    filters = list(filters)
+    if not filters:
+        return []
+
+    arr = filter_status_arrays(
+        [getattr(f, "last_service_date", None) for f in filters],
+        [getattr(f, "frequency_days", None) for f in filters],
+        today=today,
+    )
+    iso = np.datetime_as_string(arr["next_due"].astype("datetime64[D]"))
+
+    result = []
+    for i in range(len(filters)):
+        if not arr["has_due"][i]:
+            result.append(pending_status())
+            continue
+        result.append({
+            "status": STATUS_LABELS[arr["code"][i]],
+            "next_due_date": str(iso[i]),
+            "days_until_due": int(arr["days_until_due"][i]),
+            "days_overdue": int(arr["days_overdue"][i]),
+        })
+    return result
+
+
+def rollup_status_arrays(group_keys, arr):
+    """
+    Reduce per-filter status arrays to one row per group key in a single pass.
+
+    Returns (keys, rollup) where rollup is a dict of arrays aligned with keys:
+    filters_count, overdue_count, due_soon_count, min_next_due, max_days_overdue,
+    min_days_until_due, max_last_service and the `has_due` / `has_last` masks.
+    """
+    keys, inverse = np.unique(np.asarray(group_keys), return_inverse=True)
+    n = len(keys)
+    code = arr["code"]
+    has_due = arr["has_due"]
+    has_last = arr["has_last"]
+
+    min_next_due = np.full(n, _NO_DUE, dtype=np.int64)
+    np.minimum.at(min_next_due, inverse[has_due], arr["next_due"][has_due])
+
+    min_days_until = np.full(n, _NO_DUE, dtype=np.int64)
+    np.minimum.at(min_days_until, inverse[has_due], arr["days_until_due"][has_due])
+
+    max_overdue = np.zeros(n, dtype=np.int64)
+    np.maximum.at(max_overdue, inverse, arr["days_overdue"])
+
+    max_last = np.full(n, np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(max_last, inverse[has_last], arr["last_service"][has_last])
+
+    return keys, {
+        "filters_count": np.bincount(inverse, minlength=n),
+        "overdue_count": np.bincount(inverse, weights=(code == OVERDUE), minlength=n).astype(np.int64),
+        "due_soon_count": np.bincount(inverse, weights=(code == DUE_SOON), minlength=n).astype(np.int64),
+        "has_due": min_next_due != _NO_DUE,
+        "has_last": max_last != np.iinfo(np.int64).min,
+        "min_next_due": min_next_due,
+        "min_days_until_due": min_days_until,
+        "max_days_overdue": max_overdue,
+        "max_last_service": max_last,
+    }
+
+
+def compute_ahu_statuses(filters, today=None):
+    """
+    Per-AHU status rollup for a flat list of filters, keyed by ahu_id.
+
+    Each value has the compute_filter_status shape plus
+    overdue_count, due_soon_count, filters_count and last_serviced.
+    AHUs without filters are absent; callers fall back to empty_ahu_status().
+    """
+    filters = list(filters)
+    if not filters:
+        return {}
+
+    arr = filter_status_arrays(
+        [getattr(f, "last_service_date", None) for f in filters],
+        [getattr(f, "frequency_days", None) for f in filters],
+        today=today,
+    )
+    keys, roll = rollup_status_arrays([f.ahu_id for f in filters], arr)
+
+    result = {}
+    for i, key in enumerate(keys.tolist()):
+        entry = {
+            "overdue_count": int(roll["overdue_count"][i]),
+            "due_soon_count": int(roll["due_soon_count"][i]),
+            "filters_count": int(roll["filters_count"][i]),
+            "last_serviced": (
+                _day_iso(roll["max_last_service"][i]) if roll["has_last"][i] else None
+            ),
+        }
+        if not roll["has_due"][i]:
+            entry.update(pending_status())
+        else:
+            days_until = int(roll["min_days_until_due"][i])
+            if entry["overdue_count"]:
+                status = "Overdue"
+            elif days_until <= DUE_SOON_DAYS:
+                status = "Due Soon"
+            else:
+                status = "Completed"
+            entry.update({
+                "status": status,
+                "next_due_date": _day_iso(roll["min_next_due"][i]),
+                "days_until_due": 0 if status == "Overdue" else days_until,
+                "days_overdue": int(roll["max_days_overdue"][i]),
+            })
+        result[key] = entry
+    return result
@@ -1,4 +1,5 @@
 import { API } from "./api";
 
 
-export const getAHUbyQR = (ahu_id)=>API.get(`/qr/${ahu_id}`);
\ No newline at end of file
+export const getAHUbyQR = (ahu_id)=>API.get(`/qr/${ahu_id}`);
+export const resolveQRBatch = (ids) => API.post("/qr/resolve", { ids });
@@ -2,6 +2,31 @@ import { useEffect, useState } from "react";
 import { API } from "../../api/api";
 import { formatDate } from "../../utils/dates";
 
+// Signatures are served as images behind auth, so fetch them as blobs
+// (the browser still applies the endpoint's ETag / cache headers).
+function SignatureImage({ signoffId }) {
+  const [src, setSrc] = useState(null);
+
+  useEffect(() => {
+    let url = null;
+    let cancelled = false;
+    API.get(`/signatures/${signoffId}.png`, { responseType: "blob" })
+      .then((res) => {
+        if (cancelled) return;
+        url = URL.createObjectURL(res.data);
+        setSrc(url);
+      })
+      .catch((err) => console.error("Failed to load signature", err));
+    return () => {
+      cancelled = true;
+      if (url) URL.revokeObjectURL(url);
+    };
+  }, [signoffId]);
+
+  if (!src) return <div className="text-sm opacity-60">Loading signature…</div>;
+  return <img src={src} alt="signature" className="w-full max-h-96 object-contain border" />;
+}
+
 export default function AdminSignoffs() {
   const [signoffs, setSignoffs] = useState([]);
   const [selected, setSelected] = useState(null);
@@ -64,9 +89,9 @@ export default function AdminSignoffs() {
               <div className="mt-2"><strong>Summary:</strong> {selected.summary}</div>
             </div>
 
-            {selected.signature_data && (
+            {selected.signature_url && (
               <div className="mb-4">
-                <img src={selected.signature_data} alt="signature" className="w-full max-h-96 object-contain border" />
+                <SignatureImage signoffId={selected.id} />
               </div>
             )}
 
@@ -12,15 +12,27 @@ const SEVERITY_CONFIG = {
 export default function NotificationsDropdown() {
   const [open, setOpen] = useState(false);
   const [notifs, setNotifs] = useState([]);
+  const [pendingCount, setPendingCount] = useState(0);
   const ref = useRef();
 
+  // Badge polls the cheap counts endpoint; the list loads only when opened
+  const fetchCounts = async () => {
+    try {
+      const res = await API.get("/admin/notifications/counts");
+      setPendingCount(res.data?.pending || 0);
+    } catch (e) {
+      console.error("Failed to load notification counts", e);
+    }
+  };
+
   const fetchNotifs = async () => {
     try {
-      const res = await API.get("/admin/notifications");
-      setNotifs(res.data || []);
+      const res = await API.get("/admin/notifications", { params: { limit: 50 } });
+      setNotifs(res.data?.data || []);
     } catch (e) {
       console.error("Failed to load notifications", e);
     }
+    fetchCounts();
   };
 
   useEffect(() => {
@@ -32,9 +44,11 @@ export default function NotificationsDropdown() {
   }, []);
 
   useEffect(() => {
-    fetchNotifs();
-    const id = setInterval(fetchNotifs, 5000);
-    const onJobCreated = () => fetchNotifs();
+    fetchCounts();
+    // 15s keeps the badge well inside the server's per-admin limit for
+    // /notifications/counts (new jobs also refresh it via jobCreated)
+    const id = setInterval(fetchCounts, 15000);
+    const onJobCreated = () => fetchCounts();
     window.addEventListener("jobCreated", onJobCreated);
     return () => {
       clearInterval(id);
@@ -42,12 +56,47 @@ export default function NotificationsDropdown() {
     };
   }, []);
 
+  // While the panel is open, follow the admin change feed so the list updates
+  // live. Only open panels hold a stream (each one occupies a server worker).
+  // The feed takes a short-lived stream token in the URL (EventSource can't
+  // send headers); when it expires the browser's retry is refused, so fetch
+  // a new one and resume from the last event id.
+  useEffect(() => {
+    if (!open || typeof EventSource === "undefined") return;
+    let events = null;
+    let lastEventId = "";
+    let stopped = false;
+    const connect = async () => {
+      try {
+        const res = await API.post("/admin/events/token");
+        if (stopped) return;
+        const params = new URLSearchParams({ access_token: res.data.token });
+        if (lastEventId) params.set("last_event_id", lastEventId);
+        events = new EventSource(`${API.defaults.baseURL}/admin/events?${params}`);
+        const onChange = (ev) => {
+          lastEventId = ev.lastEventId || lastEventId;
+          fetchNotifs();
+        };
+        events.addEventListener("notification.created", onChange);
+        events.addEventListener("notification.updated", onChange);
+        events.onerror = () => {
+          if (events.readyState === EventSource.CLOSED && !stopped) setTimeout(connect, 3000);
+        };
+      } catch (e) {
+        console.error("Failed to open admin event feed", e);
+      }
+    };
+    connect();
+    return () => {
+      stopped = true;
+      if (events) events.close();
+    };
+  }, [open]);
+
   const severityOf = (n) => {
     return (n.level || n.type || n.severity || "info").toLowerCase();
   };
 
-  const pendingCount = notifs.filter(n => n.status === "pending").length;
-
 // Use project's date helpers so parsing/formatting matches other UI (Jobs page)
 // Adjust a Date by subtracting `hours` hours (positive hours subtracts)
 const adjustBySubtractingHours = (d, hours) => {
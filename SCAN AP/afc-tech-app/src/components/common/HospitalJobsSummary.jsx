@@ -34,7 +34,7 @@ export default function HospitalJobsSummary({
           });
         }
 
-        const jobsRes = await API.get("/jobs");
+        const jobsRes = await API.get("/jobs", { params: { hospital_id: hospitalId } });
         const jobs = jobsRes.data || [];
 
         const s = new Date(startDate);
@@ -13,29 +13,46 @@ export async function syncQueuedJobs({ max = 10 } = {}) {
   let failed = 0;
 
   const batch = jobs.slice(0, max);
+  const payloads = batch.map((j) => {
+    const raw = j.payload ?? j;
+    const { tech_id: _ignored, ...payload } = raw;
+    // local_id lets the server recognise a replay whose response was lost
+    return { ...payload, local_id: j.local_id };
+  });
 
-  for (const j of batch) {
-    const localId = j.local_id;
-    try {
-      const raw = j.payload ?? j;
-      const { tech_id: _ignored, ...payload } = raw;
-      await API.post("/jobs", payload);
+  let results;
+  try {
+    const res = await API.post("/jobs/batch", payloads);
+    results = res.data?.results || [];
+  } catch (err) {
+    if (err?.response?.status === 401) {
+      return { ok: false, synced, failed, needsLogin: true };
+    }
+    const msg =
+      err?.response?.data?.error || err?.message || "Unknown syncing error.";
+    for (const j of batch) {
+      await markJobFailed(j.local_id, msg);
+    }
+    return { ok: false, synced, failed: batch.length };
+  }
+
+  for (const r of results) {
+    const localId = batch[r.index]?.local_id;
+    if (r.ok) {
       await markJobSynced(localId);
-      try {
-        window.dispatchEvent(new Event("jobCreated"));
-      } catch (e) {
-        /* ignore */
-      }
       synced += 1;
-    } catch (err) {
-      if (err?.response?.status === 401) {
-        return { ok: false, synced, failed, needsLogin: true };
-      }
-      const msg =
-        err?.response?.data?.error || err?.message || "Unknown syncing error.";
-      await markJobFailed(localId, msg);
+    } else {
+      await markJobFailed(localId, r.error || "Unknown syncing error.");
       failed += 1;
     }
   }
+
+  if (synced) {
+    try {
+      window.dispatchEvent(new Event("jobCreated"));
+    } catch (e) {
+      /* ignore */
+    }
+  }
   return { ok: failed === 0, synced, failed };
 }